@@ -1,7 +1,7 @@
 #from flask import Flask
 from apiflask import APIFlask
 from config import Config
-from app.extensions import db
+from app.extensions import db, init_db
 from app.models import *
 
 
@@ -13,8 +13,32 @@ def create_app(config_class=Config):
                docs_path="/swagger")
     app.config.from_object(config_class)
 
+    from app.json_provider import ORJSONProvider
+    app.json = ORJSONProvider(app)
+
     # Initialize Flask extensions here
-    db.init_app(app)
+    init_db(app)
+
+    from app.replicas import init_replicas
+    init_replicas(app)
+
+    from app.query_policy import init_query_policy
+    init_query_policy(app)
+
+    from app.auth import init_auth
+    init_auth(app)
+
+    from app.passwords import init_passwords
+    init_passwords(app)
+
+    from app.conditional import init_conditional
+    init_conditional(app)
+
+    from app.cache import init_cache
+    init_cache(app)
+
+    from app.compression import init_compression
+    init_compression(app)
     
     from flask_migrate import Migrate
     migrate = Migrate(app, db, render_as_batch=True)
@@ -25,4 +49,10 @@ def create_app(config_class=Config):
     from app.blueprints import bp as bp_default
     app.register_blueprint(bp_default, url_prefix="/api")
 
+    from app.server import serve_command
+    app.cli.add_command(serve_command)
+
+    from app.blueprints.reservation.lifecycle import start_sweeper
+    start_sweeper(app)
+
     return app
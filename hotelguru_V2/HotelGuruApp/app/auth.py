@@ -0,0 +1,55 @@
+from apiflask import HTTPTokenAuth
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+auth = HTTPTokenAuth(scheme="Bearer")
+
+INSECURE_SECRET_KEYS = (None, "", "my secret key")
+
+
+def insecure_key(app):
+    # A config.py tartalék kulcsa nyilvános: vele bárki Administrator tokent írhatna alá
+    return app.config.get("SECRET_KEY") in INSECURE_SECRET_KEYS and not (app.config["TESTING"] or app.config["DEBUG"])
+
+
+def serializer():
+    # Csak a tokent aláíró / ellenőrző kérés hibázik, a migrációk és parancsok a kulcs nélkül is futnak
+    token_serializer = current_app.extensions["auth_serializer"]
+    if token_serializer is None:
+        raise RuntimeError("SECRET_KEY is not set (or is the default), refusing to sign auth tokens with it. "
+                           "Set the SECRET_KEY environment variable.")
+    return token_serializer
+
+
+def issue_token(user):
+    # Aláírt, lejáró token az azonosítóval és a szerepkörök nevével; a szerepkör-változás
+    # csak új bejelentkezéskor jelenik meg benne
+    return serializer().dumps({
+        "id": user.id,
+        "roles": [role.name for role in user.roles],
+    })
+
+
+@auth.verify_token
+def verify_token(token):
+    # Csak HMAC ellenőrzés, adatbázis nélkül: bármelyik worker/node ellenőrizheti ugyanazzal a SECRET_KEY-jel
+    try:
+        return serializer().loads(
+            token, max_age=current_app.config["AUTH_TOKEN_MAX_AGE"]
+        )
+    except BadSignature:
+        return None
+
+
+@auth.get_user_roles
+def get_user_roles(user):
+    return user["roles"]
+
+
+def init_auth(app):
+    app.config.setdefault("AUTH_TOKEN_MAX_AGE", 3600)
+    if insecure_key(app):
+        app.logger.warning("SECRET_KEY is not set (or is the default): login and token checks are disabled.")
+        app.extensions["auth_serializer"] = None
+    else:
+        app.extensions["auth_serializer"] = URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="auth-token")
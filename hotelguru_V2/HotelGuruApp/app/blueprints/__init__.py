@@ -1,4 +1,6 @@
 from apiflask import APIBlueprint
+from app.auth import auth
+from app.cache import cache_stats
 
 bp = APIBlueprint('main', __name__, tag="default")
 
@@ -6,6 +8,11 @@ bp = APIBlueprint('main', __name__, tag="default")
 def index():
     return 'This is The Main Blueprint'
 
+@bp.get('/cache/stats')
+@bp.auth_required(auth, roles=["Administrator"])
+def response_cache_stats():
+    return cache_stats(), 200
+
 from app.blueprints.user import bp as bp_user
 bp.register_blueprint(bp_user, url_prefix='/user')
 
@@ -18,5 +25,11 @@ bp.register_blueprint(bp_service, url_prefix='/service')
 from app.blueprints.reservation import bp as bp_reservation
 bp.register_blueprint(bp_reservation, url_prefix='/reservation')
 
+from app.blueprints.export import bp as bp_export
+bp.register_blueprint(bp_export, url_prefix='/export')
+
+from app.blueprints.invoice import bp as bp_invoice
+bp.register_blueprint(bp_invoice, url_prefix='/invoice')
+
 
 from app.models import *
\ No newline at end of file
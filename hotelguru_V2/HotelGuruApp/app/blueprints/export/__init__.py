@@ -0,0 +1,5 @@
+from apiflask import APIBlueprint
+
+bp = APIBlueprint('export', __name__, tag="export", cli_group="export")
+
+from app.blueprints.export import routes, commands
\ No newline at end of file
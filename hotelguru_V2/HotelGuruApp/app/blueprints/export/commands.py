@@ -0,0 +1,39 @@
+import sys
+import time
+
+import click
+
+from app.blueprints.export import bp
+from app.blueprints.export.service import ExportService
+
+
+def export_command(kind):
+    @click.option("--start", required=True, type=click.DateTime(formats=["%Y-%m-%d"]))
+    @click.option("--end", required=True, type=click.DateTime(formats=["%Y-%m-%d"]))
+    @click.option("--format", "export_format", default="ndjson", type=click.Choice(["ndjson", "csv"]))
+    @click.option("--gzip", "compress", is_flag=True, help="Compress the output with gzip.")
+    @click.option("--output", "-o", type=click.Path(dir_okay=False), help="Output file (default: stdout).")
+    def command(start, end, export_format, compress, output):
+        started = time.perf_counter()
+        success, chunks = ExportService.export(kind, {"start": start.date(), "end": end.date(), "format": export_format})
+        if not success:
+            raise click.ClickException(chunks)
+
+        chunks = ExportService.gzip(chunks) if compress else (chunk.encode("utf-8") for chunk in chunks)
+        written = 0
+        stream = open(output, "wb") if output else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                stream.write(chunk)
+                written += len(chunk)
+        finally:
+            if output:
+                stream.close()
+        click.echo(f"{kind}: {written} bytes in {time.perf_counter() - started:.2f}s", err=True)
+
+    command.__doc__ = f"Stream {kind} starting in [start, end) as NDJSON or CSV."
+    return command
+
+
+bp.cli.command("reservations")(export_command("reservations"))
+bp.cli.command("invoices")(export_command("invoices"))
@@ -0,0 +1,39 @@
+from flask import Response, request, stream_with_context
+from app.blueprints.export import bp
+from app.blueprints.export.schemas import ExportQuerySchema
+from app.blueprints.export.service import ExportService, MIMETYPES
+from apiflask import HTTPError
+from app.auth import auth
+
+@bp.route('/')
+def index():
+    return 'This is The Export Blueprint'
+
+
+def stream_export(kind, query_data):
+    success, response = ExportService.export(kind, query_data)
+    if not success:
+        raise HTTPError(message=response, status_code=400)
+
+    extension = query_data["format"]
+    headers = {"Content-Disposition": f"attachment; filename={kind}_{query_data['start']}_{query_data['end']}.{extension}"}
+    chunks = (chunk.encode("utf-8") for chunk in response)
+    if request.accept_encodings["gzip"]:
+        chunks = ExportService.gzip(response)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(stream_with_context(chunks), mimetype=MIMETYPES[extension], headers=headers)
+
+
+@bp.get('/reservations')
+@bp.auth_required(auth, roles=["Administrator"])
+@bp.input(ExportQuerySchema, location="query")
+def export_reservations(query_data):
+    return stream_export("reservations", query_data)
+
+
+@bp.get('/invoices')
+@bp.auth_required(auth, roles=["Administrator"])
+@bp.input(ExportQuerySchema, location="query")
+def export_invoices(query_data):
+    return stream_export("invoices", query_data)
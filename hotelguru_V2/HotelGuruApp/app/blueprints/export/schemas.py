@@ -0,0 +1,8 @@
+from marshmallow import Schema, fields
+from apiflask.validators import OneOf
+
+
+class ExportQuerySchema(Schema):
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
+    format = fields.String(load_default="ndjson", validate=OneOf(["ndjson", "csv"]))
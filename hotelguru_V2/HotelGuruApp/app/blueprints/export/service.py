@@ -0,0 +1,138 @@
+from app.extensions import db
+from app.models.reservation import Reservation
+from app.models.invoice import Invoice
+from app.models.room import Room
+from app.models.association_tables import reservation_room
+
+from sqlalchemy import select
+from itertools import groupby
+import csv
+import io
+import json
+import zlib
+
+# Soronkénti lekérés a szerver oldali kurzorból, így a memóriahasználat állandó
+YIELD_PER = 1000
+# Ennyi bájt gyűlik össze egy kiküldött darabban
+CHUNK_SIZE = 64 * 1024
+
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+COLUMNS = {
+    "reservations": ["id", "user_id", "start_date", "end_date", "reservation_date", "status", "room_numbers"],
+    "invoices": ["id", "reservation_id", "issue_date", "amount", "status"],
+}
+
+
+class ExportService:
+
+    @staticmethod
+    def reservation_rows(start, end):
+        # A kezdő dátum szerinti szűrés miatt egymást követő időszakok exportja nem fed át
+        rows = db.session.execute(
+            select(
+                Reservation.id,
+                Reservation.user_id,
+                Reservation.start_date,
+                Reservation.end_date,
+                Reservation.reservation_date,
+                Reservation.status,
+                Room.number
+            ).outerjoin(
+                reservation_room, reservation_room.c.reservation_id == Reservation.id
+            ).outerjoin(
+                Room, Room.id == reservation_room.c.room_id
+            ).where(
+                Reservation.start_date >= start,
+                Reservation.start_date < end
+            ).order_by(Reservation.id).execution_options(yield_per=YIELD_PER)
+        )
+        # Egy foglalás szobái egymás után jönnek, ezért elég a szomszédos sorokat összevonni
+        for _, group in groupby(rows, key=lambda row: row.id):
+            group = list(group)
+            first = group[0]
+            yield {
+                "id": first.id,
+                "user_id": first.user_id,
+                "start_date": first.start_date.isoformat(),
+                "end_date": first.end_date.isoformat(),
+                "reservation_date": first.reservation_date.isoformat(),
+                "status": first.status,
+                "room_numbers": [row.number for row in group if row.number is not None],
+            }
+
+    @staticmethod
+    def invoice_rows(start, end):
+        rows = db.session.execute(
+            select(
+                Invoice.id,
+                Invoice.reservation_id,
+                Invoice.issue_date,
+                Invoice.amount,
+                Invoice.status
+            ).where(
+                Invoice.issue_date >= start,
+                Invoice.issue_date < end
+            ).order_by(Invoice.id).execution_options(yield_per=YIELD_PER)
+        )
+        for row in rows:
+            yield {
+                "id": row.id,
+                "reservation_id": row.reservation_id,
+                "issue_date": row.issue_date.isoformat(),
+                "amount": row.amount,
+                "status": row.status.name if hasattr(row.status, "name") else row.status,
+            }
+
+    @staticmethod
+    def ndjson(rows):
+        buffer = []
+        size = 0
+        for row in rows:
+            line = json.dumps(row, ensure_ascii=False) + "\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer)
+
+    @staticmethod
+    def csv(rows, columns):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([
+                " ".join(map(str, row[column])) if isinstance(row[column], list) else row[column]
+                for column in columns
+            ])
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def gzip(chunks):
+        # Menet közbeni tömörítés: a gzip fejlécet és a darabokat azonnal továbbadjuk
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def export(kind, request):
+        if request["start"] >= request["end"]:
+            return False, "The start date must be earlier than the end date!"
+        if kind == "reservations":
+            rows = ExportService.reservation_rows(request["start"], request["end"])
+        else:
+            rows = ExportService.invoice_rows(request["start"], request["end"])
+        if request["format"] == "csv":
+            return True, ExportService.csv(rows, COLUMNS[kind])
+        return True, ExportService.ndjson(rows)
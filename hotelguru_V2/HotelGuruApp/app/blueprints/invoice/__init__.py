@@ -0,0 +1,5 @@
+from apiflask import APIBlueprint
+
+bp = APIBlueprint('invoice', __name__, tag="invoice", cli_group="invoice")
+
+from app.blueprints.invoice import routes, commands, closing
@@ -0,0 +1,135 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+import click
+from sqlalchemy import create_engine, select, update, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.pool import NullPool
+
+from app.extensions import db
+from app.blueprints.invoice import bp
+from app.blueprints.invoice.service import InvoiceService, BILLABLE_STATUSES
+from app.models.invoice import Invoice, StatusEnum
+from app.models.invoice_checkpoint import InvoiceCloseCheckpoint
+from app.models.reservation import Reservation
+
+# Munkafolyamatonként saját engine, a szülő kapcsolatait nem örököljük
+_engine = None
+
+
+def closed_stays(start, end):
+    # A hónapban távozott, visszaigazolt vagy lezárt foglalások
+    return (
+        Reservation.status.in_(BILLABLE_STATUSES),
+        Reservation.end_date >= start,
+        Reservation.end_date < end,
+    )
+
+
+def init_worker(database_uri):
+    global _engine
+    # SQLite: az írók sorban jutnak a zárhoz, ezért hosszabb várakozás
+    _engine = create_engine(database_uri, poolclass=NullPool, connect_args={"timeout": 60})
+
+
+def close_chunk(month, start, end, first_id, last_id):
+    # Egy id tartomány élő számláinak végleges újraárazása és lezárása; a checkpoint ugyanabban
+    # a tranzakcióban íródik, így összeomlás után a tartomány vagy kész, vagy érintetlen
+    expected = Invoice.amounts(
+        *closed_stays(start, end),
+        Invoice.id.between(first_id, last_id),
+        Invoice.status == StatusEnum.Live
+    ).subquery()
+    with _engine.begin() as connection:
+        closed = connection.execute(
+            update(Invoice)
+            .where(Invoice.id == expected.c.invoice_id)
+            .values(amount=expected.c.amount, status=StatusEnum.Colsed)
+        ).rowcount
+        # Ugyanazzal a kezdő id-val újrafutott (pl. azóta bővült) tartomány a korábbi sort frissíti
+        checkpoint = sqlite_insert(InvoiceCloseCheckpoint).values(
+            month=month, first_id=first_id, last_id=last_id, closed=closed, finished_at=datetime.now()
+        )
+        connection.execute(checkpoint.on_conflict_do_update(
+            index_elements=[InvoiceCloseCheckpoint.month, InvoiceCloseCheckpoint.first_id],
+            set_={
+                "last_id": checkpoint.excluded.last_id,
+                "closed": InvoiceCloseCheckpoint.closed + checkpoint.excluded.closed,
+                "finished_at": checkpoint.excluded.finished_at,
+            }
+        ))
+    return closed
+
+
+def close_month(month, workers, chunk_size):
+    started = time.perf_counter()
+    start = month.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    month_key = start.strftime("%Y-%m")
+
+    # Hiányzó számlák létrehozása halmazalapon, mielőtt a darabokat kiosztjuk
+    success, generated = InvoiceService.generate_invoices({"start": start, "end": end, "recalculate": False})
+    if not success:
+        raise click.ClickException(generated)
+
+    # Rögzített szélességű id tartományok a hónap (élő vagy már lezárt) számláin, így újraindításkor
+    # ugyanazok a határok jönnek ki. Kihagyható a pontosan ugyanilyen (first_id, last_id) checkpointtal
+    # rendelkező tartomány, ha azóta nem került bele élő számla (más --chunk-size vagy azóta bővült
+    # utolsó tartomány más határt ad, az újra lefut)
+    first_id, last_id = db.session.execute(
+        select(func.min(Invoice.id), func.max(Invoice.id)).join(
+            Reservation, Reservation.id == Invoice.reservation_id
+        ).where(*closed_stays(start, end), Invoice.status.in_([StatusEnum.Live, StatusEnum.Colsed]))
+    ).one()
+    done = set(db.session.execute(
+        select(InvoiceCloseCheckpoint.first_id, InvoiceCloseCheckpoint.last_id).where(
+            InvoiceCloseCheckpoint.month == month_key
+        )
+    ).tuples())
+    chunks, pending = [], []
+    if first_id is not None:
+        chunks = [(low, min(low + chunk_size - 1, last_id)) for low in range(first_id, last_id + 1, chunk_size)]
+        live = set(db.session.execute(
+            select(((Invoice.id - first_id) // chunk_size).label("chunk")).join(
+                Reservation, Reservation.id == Invoice.reservation_id
+            ).where(*closed_stays(start, end), Invoice.status == StatusEnum.Live).distinct()
+        ).scalars())
+        pending = [chunk for number, chunk in enumerate(chunks) if chunk not in done or number in live]
+
+    database_uri = db.engine.url.render_as_string(hide_password=False)
+    db.session.commit()
+    db.engine.dispose()
+
+    closed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(database_uri,)) as pool:
+        futures = [pool.submit(close_chunk, month_key, start, end, low, high) for low, high in pending]
+        for finished, future in enumerate(as_completed(futures), 1):
+            closed += future.result()
+            click.echo(f"\r{finished}/{len(pending)} chunks, {closed} invoices closed", nl=False, err=True)
+    if pending:
+        click.echo(err=True)
+
+    return {
+        "month": month_key,
+        "generated": generated["created"],
+        "chunks": len(chunks),
+        "skipped": len(chunks) - len(pending),
+        "closed": closed,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+@bp.cli.command("close-month")
+@click.option("--month", type=click.DateTime(formats=["%Y-%m"]), help="Month to close (default: previous month).")
+@click.option("--workers", default=os.cpu_count(), show_default=True, help="Number of worker processes.")
+@click.option("--chunk-size", default=1000, show_default=True, help="Invoice ids per chunk.")
+def close_month_command(month, workers, chunk_size):
+    """Finalize and close the invoices of every stay that ended in the month."""
+    month = month.date() if month else (date.today().replace(day=1) - timedelta(days=1))
+    report = close_month(month, workers, chunk_size)
+    rate = report["closed"] / report["elapsed"] if report["elapsed"] else 0
+    click.echo(f"month={report['month']} generated={report['generated']} chunks={report['chunks']} "
+               f"skipped={report['skipped']} closed={report['closed']} "
+               f"elapsed={report['elapsed']:.2f}s throughput={rate:.0f} invoices/s")
@@ -0,0 +1,19 @@
+import click
+
+from app.blueprints.invoice import bp
+from app.blueprints.invoice.service import InvoiceService
+
+
+@bp.cli.command("reconcile")
+@click.option("--fix", is_flag=True, help="Overwrite drifted totals with the recomputed amount.")
+@click.option("--tolerance", default=0.01, show_default=True, help="Ignore differences up to this amount.")
+@click.option("--show", default=10, show_default=True, help="Number of worst invoices to list.")
+def reconcile_command(fix, tolerance, show):
+    """Recompute live invoice totals in bulk and report drift."""
+    report = InvoiceService.reconcile(fix, tolerance, show)
+    for row in report["worst"]:
+        click.echo(f"invoice {row['id']}: stored={row['amount']} expected={row['expected']} drift={row['drift']:+.2f}")
+    click.echo(f"checked={report['checked']} drifted={report['drifted']} drift={report['drift']:+.2f} "
+               f"fixed={report['fixed']} elapsed={report['elapsed']:.3f}s")
+    if report["drifted"] and not fix:
+        raise SystemExit(1)
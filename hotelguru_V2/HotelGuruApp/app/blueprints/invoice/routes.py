@@ -0,0 +1,38 @@
+from app.blueprints.invoice import bp
+from app.blueprints.invoice.schemas import InvoiceGenerateSchema, InvoiceGenerateResponseSchema, InvoiceChargeSchema, InvoiceResponseSchema
+from app.blueprints.invoice.service import InvoiceService
+from apiflask import HTTPError
+from app.auth import auth
+
+@bp.route('/')
+def index():
+    return 'This is The Invoice Blueprint'
+
+@bp.post('/generate')
+@bp.auth_required(auth, roles=["Administrator", "Receptionist"])
+@bp.input(InvoiceGenerateSchema, location="json")
+@bp.output(InvoiceGenerateResponseSchema)
+def invoice_generate(json_data):
+    success, response = InvoiceService.generate_invoices(json_data)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
+@bp.get('/list/<int:iid>')
+@bp.auth_required(auth, roles=["Administrator", "Receptionist"])
+@bp.output(InvoiceResponseSchema)
+def invoice_by_id(iid):
+    success, response = InvoiceService.invoice_by_id(iid)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
+@bp.post('/charge/<int:iid>')
+@bp.auth_required(auth, roles=["Administrator", "Receptionist"])
+@bp.input(InvoiceChargeSchema, location="json")
+@bp.output(InvoiceResponseSchema)
+def invoice_charge(iid, json_data):
+    success, response = InvoiceService.charge_services(iid, json_data)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
@@ -0,0 +1,36 @@
+from marshmallow import Schema, fields
+from apiflask.validators import Length, Range
+
+
+class InvoiceGenerateSchema(Schema):
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
+    issue_date = fields.Date()
+    recalculate = fields.Boolean(load_default=False)
+
+class InvoiceGenerateResponseSchema(Schema):
+    created = fields.Integer()
+    recalculated = fields.Integer()
+    amount = fields.Float()
+    elapsed = fields.Float()
+
+
+class InvoiceChargeItem(Schema):
+    service_id = fields.Integer(required=True)
+    quantity = fields.Integer(load_default=1, validate=Range(min=1))
+
+class InvoiceChargeSchema(Schema):
+    services = fields.List(fields.Nested(InvoiceChargeItem), required=True, validate=Length(min=1))
+
+class InvoiceItemSchema(Schema):
+    service_id = fields.Integer()
+    name = fields.String()
+    quantity = fields.Integer()
+    unit_price = fields.Float()
+
+class InvoiceResponseSchema(Schema):
+    id = fields.Integer()
+    reservation_id = fields.Integer()
+    amount = fields.Float()
+    issue_date = fields.String()
+    items = fields.List(fields.Nested(InvoiceItemSchema))
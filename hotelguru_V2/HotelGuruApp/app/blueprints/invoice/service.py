@@ -0,0 +1,172 @@
+from app.extensions import db
+from app.models.invoice import Invoice, StatusEnum
+from app.models.reservation import Reservation
+from app.models.service import Service
+from app.models.association_tables import invoice_service
+
+from sqlalchemy import select, insert, update, literal, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.types import Date
+from collections import Counter
+from datetime import date
+import time
+
+# Számlázható foglalások: visszaigazolt vagy már lezárt tartózkodás
+BILLABLE_STATUSES = ("Success", "Completed")
+
+
+class InvoiceService:
+
+    @staticmethod
+    def generate_invoices(request):
+        if request["start"] >= request["end"]:
+            return False, "The start date must be earlier than the end date!"
+        started = time.perf_counter()
+        issue_date = request.get("issue_date") or date.today()
+        # A távozás napja (end_date) szerint: a [start, end) időszakban kijelentkezők
+        billable = (
+            Reservation.status.in_(BILLABLE_STATUSES),
+            Reservation.end_date >= request["start"],
+            Reservation.end_date < request["end"],
+        )
+        try:
+            recalculated = 0
+            if request["recalculate"]:
+                # Élő számlák újraárazása (árváltozás, új szolgáltatás) egyetlen UPDATE ... FROM utasítással
+                amounts = Invoice.amounts(*billable, Invoice.status == StatusEnum.Live).subquery()
+                recalculated = db.session.execute(
+                    update(Invoice)
+                    .where(Invoice.id == amounts.c.invoice_id)
+                    .values(amount=amounts.c.amount)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+
+            # Számla nélküli foglalások: INSERT ... SELECT, soronkénti lekérdezés nélkül
+            amounts = Invoice.amounts(*billable, Invoice.id.is_(None)).subquery()
+            created = db.session.execute(
+                insert(Invoice).from_select(
+                    ["reservation_id", "amount", "issue_date", "status"],
+                    select(
+                        amounts.c.reservation_id,
+                        amounts.c.amount,
+                        literal(issue_date, Date),
+                        literal(StatusEnum.Live, Invoice.status.type)
+                    )
+                ).returning(Invoice.amount)
+            ).scalars().all()
+            db.session.commit()
+
+        except Exception as ex:
+            print(ex)
+            db.session.rollback()
+            return False, "generate_invoices() error!"
+        return True, {
+            "created": len(created),
+            "recalculated": recalculated,
+            "amount": sum(created),
+            "elapsed": time.perf_counter() - started,
+        }
+
+    @staticmethod
+    def invoice_response(invoice):
+        items = db.session.execute(
+            select(
+                invoice_service.c.service_id,
+                Service.name,
+                invoice_service.c.quantity,
+                invoice_service.c.unit_price
+            ).join(
+                Service, Service.id == invoice_service.c.service_id
+            ).where(invoice_service.c.invoice_id == invoice.id).order_by(invoice_service.c.service_id)
+        ).mappings().all()
+        return {
+            "id": invoice.id,
+            "reservation_id": invoice.reservation_id,
+            "amount": invoice.amount,
+            "issue_date": invoice.issue_date.isoformat(),
+            "items": items,
+        }
+
+    @staticmethod
+    def invoice_by_id(iid):
+        invoice = db.session.get(Invoice, iid)
+        if invoice is None:
+            return False, "Invoice not found!"
+        return True, InvoiceService.invoice_response(invoice)
+
+    @staticmethod
+    def charge_services(iid, request):
+        quantities = Counter()
+        for item in request["services"]:
+            quantities[item["service_id"]] += item["quantity"]
+        try:
+            invoice = db.session.get(Invoice, iid)
+            if invoice is None:
+                return False, "Invoice not found!"
+            if invoice.status != StatusEnum.Live:
+                return False, "Only live invoices can be charged!"
+            prices = dict(db.session.execute(
+                select(Service.id, Service.price).where(Service.id.in_(quantities), Service.deleted == 0)
+            ).all())
+            if len(prices) != len(quantities):
+                return False, "Service not found!"
+
+            # Meglévő tételsornál csak a mennyiség nő, az egységár a korábbi marad
+            lines = sqlite_insert(invoice_service).values([
+                {"invoice_id": iid, "service_id": sid, "quantity": quantity, "unit_price": prices[sid]}
+                for sid, quantity in quantities.items()
+            ])
+            lines = lines.on_conflict_do_update(
+                index_elements=[invoice_service.c.invoice_id, invoice_service.c.service_id],
+                set_={"quantity": invoice_service.c.quantity + lines.excluded.quantity}
+            ).returning(invoice_service.c.service_id, invoice_service.c.unit_price)
+            charged = sum(quantities[row.service_id] * row.unit_price for row in db.session.execute(lines))
+
+            # Növekményes végösszeg: a teljes számla újraszámolása nélkül
+            db.session.execute(
+                update(Invoice)
+                .where(Invoice.id == iid)
+                .values(amount=func.coalesce(Invoice.amount, 0) + charged)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            db.session.refresh(invoice)
+
+        except Exception as ex:
+            print(ex)
+            db.session.rollback()
+            return False, "charge_services() error!"
+        return True, InvoiceService.invoice_response(invoice)
+
+    @staticmethod
+    def reconcile(fix=False, tolerance=0.01, show=10):
+        # A tárolt végösszeg összevetése a halmazalapú újraszámolással, az élő számlákon
+        started = time.perf_counter()
+        expected = Invoice.amounts(Invoice.status == StatusEnum.Live).subquery()
+        drift = func.coalesce(Invoice.amount, 0) - expected.c.amount
+        drifted = select(Invoice.id, Invoice.amount, expected.c.amount.label("expected"), drift.label("drift")).join(
+            expected, expected.c.invoice_id == Invoice.id
+        ).where(func.abs(drift) > tolerance)
+
+        checked = db.session.execute(select(func.count()).select_from(expected)).scalar_one()
+        summary = drifted.subquery()
+        count, total = db.session.execute(select(func.count(), func.coalesce(func.sum(summary.c.drift), 0))).one()
+        worst = db.session.execute(drifted.order_by(func.abs(drift).desc()).limit(show)).mappings().all()
+
+        fixed = 0
+        if fix and count:
+            fixed = db.session.execute(
+                update(Invoice)
+                .where(Invoice.id == expected.c.invoice_id, func.abs(drift) > tolerance)
+                .values(amount=expected.c.amount)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+        return {
+            "checked": checked,
+            "drifted": count,
+            "drift": total,
+            "fixed": fixed,
+            "worst": worst,
+            "elapsed": time.perf_counter() - started,
+        }
@@ -1,5 +1,5 @@
 from apiflask import APIBlueprint
 
-bp = APIBlueprint('reservation', __name__, tag="reservation")
+bp = APIBlueprint('reservation', __name__, tag="reservation", cli_group="reservation")
 
-from app.blueprints.reservation import routes
\ No newline at end of file
+from app.blueprints.reservation import routes, lifecycle, commands
\ No newline at end of file
@@ -0,0 +1,19 @@
+import time
+
+import click
+
+from app.extensions import db
+from app.blueprints.reservation import bp
+from app.models.daily_stats import DailyStats
+
+
+@bp.cli.command("rebuild-stats")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day to rebuild (default: all).")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Day after the last day to rebuild.")
+def rebuild_stats_command(start, end):
+    """Rebuild the daily_stats rollup from the reservations."""
+    started = time.perf_counter()
+    DailyStats.rebuild(start.date() if start else None, end.date() if end else None)
+    db.session.commit()
+    rows = db.session.query(DailyStats).count()
+    click.echo(f"daily_stats rows={rows} elapsed={time.perf_counter() - started:.2f}s")
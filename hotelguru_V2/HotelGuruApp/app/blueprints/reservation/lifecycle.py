@@ -0,0 +1,86 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import click
+from flask import current_app
+from sqlalchemy import select, update
+
+from app.extensions import db
+from app.blueprints.reservation import bp
+from app.models.reservation import Reservation
+from app.models.daily_stats import DailyStats
+from app.cache import invalidate
+
+
+def update_in_batches(condition, status, batch_size):
+    # Halmazalapú UPDATE korlátos kötegekben, ORM objektumok betöltése nélkül
+    touched = 0
+    while True:
+        batch = db.session.execute(select(Reservation.id).where(condition).limit(batch_size)).scalars().all()
+        # A napi összesítőből a régi állapot kikerül, az új bekerül (élő -> lezárt esetén nettó nulla)
+        DailyStats.apply(Reservation.id.in_(batch), -1)
+        rowcount = db.session.execute(
+            update(Reservation)
+            .where(Reservation.id.in_(batch))
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        DailyStats.apply(Reservation.id.in_(batch))
+        if rowcount:
+            invalidate("availability")
+        db.session.commit()
+        touched += rowcount
+        if rowcount < batch_size:
+            return touched
+
+
+def sweep_reservations(today=None):
+    started = time.perf_counter()
+    today = today or date.today()
+    batch_size = current_app.config["RESERVATION_SWEEP_BATCH"]
+    deadline = today - timedelta(days=current_app.config["RESERVATION_CONFIRM_DAYS"])
+
+    # Meg nem erősített foglalás lejár, ha túl régi vagy már elkezdődött volna -> a szobák felszabadulnak
+    expired = update_in_batches(
+        (Reservation.status == "Depending")
+        & ((Reservation.reservation_date <= deadline) | (Reservation.start_date <= today)),
+        "Expired", batch_size
+    )
+    # Véget ért, visszaigazolt tartózkodás lezárása
+    completed = update_in_batches(
+        (Reservation.status == "Success") & (Reservation.end_date <= today),
+        "Completed", batch_size
+    )
+    return {"expired": expired, "completed": completed, "elapsed": time.perf_counter() - started}
+
+
+def start_sweeper(app):
+    interval = app.config["RESERVATION_SWEEP_INTERVAL"]
+    if interval <= 0:
+        return None
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    report = sweep_reservations()
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception("Reservation sweep failed")
+                else:
+                    app.logger.info("Reservation sweep: expired=%(expired)d completed=%(completed)d elapsed=%(elapsed).3fs", report)
+
+    threading.Thread(target=run, name="reservation-sweeper", daemon=True).start()
+    app.extensions["reservation_sweeper"] = stop
+    return stop
+
+
+@bp.cli.command("sweep")
+@click.option("--today", type=click.DateTime(formats=["%Y-%m-%d"]), help="Run as if it were this day.")
+def sweep_command(today):
+    """Expire unconfirmed and complete finished reservations."""
+    report = sweep_reservations(today.date() if today else None)
+    click.echo(f"expired={report['expired']} completed={report['completed']} elapsed={report['elapsed']:.3f}s")
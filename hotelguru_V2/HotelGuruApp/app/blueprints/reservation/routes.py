@@ -1,17 +1,21 @@
 from app.blueprints.reservation import bp
-from app.blueprints.reservation.schemas import ReservationListSchema, ReservationRequestSchema, ReservationResponseSchema, ReservationUpdateSchema, ReservationByUserSchema
-from app.blueprints.reservation.service import ReservationService
+from app.blueprints.reservation.schemas import ReservationListSchema, ReservationRequestSchema, ReservationResponseSchema, ReservationUpdateSchema, ReservationByUserSchema, CalendarQuerySchema, CalendarSchema, ReservationBatchRequestSchema, ReservationBatchResponseSchema, ReservationListQuerySchema, ReservationPageSchema, ReservationByUserPageSchema, StatsQuerySchema, StatsSchema
+from app.blueprints.reservation.service import ReservationService, BookingConflict
 from apiflask.fields import String, Integer
 from apiflask import HTTPError
+from app.auth import auth
+from app.replicas import replica
 
 @bp.route('/')
 def index():
     return 'This is The Reservation Blueprint'
 
 @bp.get('/list/')
-@bp.output(ReservationListSchema(many = True))
-def reservation_list_all():
-    success, response = ReservationService.reservation_list_all()
+@replica
+@bp.input(ReservationListQuerySchema, location="query")
+@bp.output(ReservationPageSchema)
+def reservation_list_all(query_data):
+    success, response = ReservationService.reservation_list_all(query_data)
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
@@ -19,14 +23,17 @@ def reservation_list_all():
 
 
 @bp.get('/list_by_room/<int:rid>')
-@bp.output(ReservationListSchema(many = True))
-def reservation_list_by_room(rid):
-    success, response = ReservationService.serach_reservation_by_room(rid)
+@replica
+@bp.input(ReservationListQuerySchema, location="query")
+@bp.output(ReservationPageSchema)
+def reservation_list_by_room(rid, query_data):
+    success, response = ReservationService.serach_reservation_by_room(rid, query_data)
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
 
 @bp.get('/search_by_id/<int:rid>')
+@replica
 @bp.output(ReservationListSchema)
 def reservation_search_by_id(rid):
     success, response = ReservationService.serach_reservation_by_id(rid)
@@ -35,19 +42,60 @@ def reservation_search_by_id(rid):
     raise HTTPError(message=response, status_code=400)
 
 @bp.get('/list_by_user/<int:uid>')
-@bp.output(ReservationByUserSchema(many = True))
-def reservation_by_user(uid):
-    success, response = ReservationService.serach_reservation_by_user(uid)
+@replica
+@bp.input(ReservationListQuerySchema, location="query")
+@bp.output(ReservationByUserPageSchema)
+def reservation_by_user(uid, query_data):
+    success, response = ReservationService.serach_reservation_by_user(uid, query_data)
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
 
 
 
+@bp.get('/calendar')
+@replica
+@bp.input(CalendarQuerySchema, location="query")
+@bp.output(CalendarSchema)
+def reservation_calendar(query_data):
+    success, response = ReservationService.reservation_calendar(query_data)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
+
+@bp.get('/stats')
+@bp.auth_required(auth, roles=["Administrator"])
+@bp.input(StatsQuerySchema, location="query")
+@bp.output(StatsSchema)
+def reservation_stats(query_data):
+    success, response = ReservationService.reservation_stats(query_data)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
+
 @bp.post('/add')
 @bp.input(ReservationRequestSchema, location="json")
+@bp.output(ReservationResponseSchema)
 def reservation_add(json_data):
-    success, response = ReservationService.add_reservation(json_data)
+    try:
+        success, response = ReservationService.add_reservation(json_data)
+    except BookingConflict as ex:
+        raise HTTPError(message=str(ex), status_code=409)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
+
+@bp.post('/add_batch')
+@bp.input(ReservationBatchRequestSchema, location="json")
+@bp.output(ReservationBatchResponseSchema)
+def reservation_add_batch(json_data):
+    try:
+        success, response = ReservationService.add_reservation_batch(json_data)
+    except BookingConflict as ex:
+        raise HTTPError(message=str(ex), status_code=409)
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
@@ -57,7 +105,10 @@ def reservation_add(json_data):
 @bp.input(ReservationUpdateSchema, location="json")
 @bp.output(ReservationResponseSchema)
 def reservation_update(rid, json_data):
-    success, response = ReservationService.update_reservation(rid, json_data)
+    try:
+        success, response = ReservationService.update_reservation(rid, json_data)
+    except BookingConflict as ex:
+        raise HTTPError(message=str(ex), status_code=409)
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
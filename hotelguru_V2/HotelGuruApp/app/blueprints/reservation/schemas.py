@@ -1,6 +1,6 @@
 from marshmallow import Schema, fields
 from apiflask.fields import String, Email, Nested, Integer, List, Date
-from apiflask.validators import Length, OneOf, Email
+from apiflask.validators import Length, OneOf, Email, Range
 
 from app.models.reservation import Reservation
 from app.blueprints.user.schemas import UserResponseSchema
@@ -11,16 +11,30 @@ class SchemaForRoom(Schema):
     number = fields.Integer()
 
 class RoomTypeRequestItem(Schema):
-    room_type_id = fields.Integer()
-    quantity = fields.Integer()
+    room_type_id = fields.Integer(required=True)
+    quantity = fields.Integer(required=True, validate=Range(min=1))
 
 class ReservationRequestSchema(Schema):
     user = fields.Integer()
     start_date = fields.Date()
     end_date = fields.Date()
     reservation_date = fields.Date()
-    room_numbers = fields.List(fields.Integer())
+    room_numbers = fields.List(fields.Integer(), load_default=list)
+    room_types = fields.List(fields.Nested(RoomTypeRequestItem), load_default=list)
+
+
+class ReservationBatchRequestSchema(Schema):
+    reservations = fields.List(fields.Nested(ReservationRequestSchema), required=True, validate=Length(min=1, max=1000))
+
+class ReservationBatchItemSchema(Schema):
+    index = fields.Integer()
+    success = fields.Boolean()
+    reservation_id = fields.Integer(allow_none=True)
+    message = fields.String()
 
+class ReservationBatchResponseSchema(Schema):
+    created = fields.Integer()
+    results = fields.List(fields.Nested(ReservationBatchItemSchema))
     
 class ReservationUpdateSchema(Schema):
     start_date = fields.Date()
@@ -53,3 +67,59 @@ class ReservationByUserSchema(Schema):
     rooms = fields.List(fields.Nested(SchemaForRoom))
     status = fields.String()
 
+# Egy oldalon visszaadható foglalások maximális száma
+PAGE_SIZE_MAX = 200
+
+class ReservationListQuerySchema(Schema):
+    cursor = fields.String()
+    limit = fields.Integer(load_default=50, validate=Range(min=1, max=PAGE_SIZE_MAX))
+    start = fields.Date()
+    end = fields.Date()
+    status = fields.String(validate=OneOf(["Depending", "Success", "Completed", "Expired", "Canceled"]))
+
+class ReservationPageSchema(Schema):
+    items = fields.List(fields.Nested(ReservationListSchema))
+    next_cursor = fields.String(allow_none=True)
+
+class ReservationByUserPageSchema(Schema):
+    items = fields.List(fields.Nested(ReservationByUserSchema))
+    next_cursor = fields.String(allow_none=True)
+
+class CalendarQuerySchema(Schema):
+    start = fields.Date(required=True)
+    days = fields.Integer(load_default=30, validate=Range(min=1, max=90))
+
+class CalendarRoomSchema(Schema):
+    number = fields.Integer()
+    # [reservation_id, napok száma] párok, 0 = szabad
+    runs = fields.List(fields.List(fields.Integer()))
+
+class CalendarSchema(Schema):
+    start = fields.String()
+    days = fields.Integer()
+    rooms = fields.List(fields.Nested(CalendarRoomSchema))
+
+
+# Riport: legfeljebb ennyi napos időszak kérhető le egyszerre
+STATS_DAYS_MAX = 3660
+
+class StatsQuerySchema(Schema):
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
+    room_type_id = fields.Integer()
+    by_type = fields.Boolean(load_default=True)
+
+class StatsDaySchema(Schema):
+    day = fields.String()
+    room_type_id = fields.Integer(allow_none=True)
+    rooms = fields.Integer()
+    rooms_sold = fields.Integer()
+    revenue = fields.Float()
+    occupancy = fields.Float()
+    adr = fields.Float()
+    revpar = fields.Float()
+
+class StatsSchema(Schema):
+    start = fields.String()
+    end = fields.String()
+    days = fields.List(fields.Nested(StatsDaySchema))
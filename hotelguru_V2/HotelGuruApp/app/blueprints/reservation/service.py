@@ -1,115 +1,471 @@
 from platform import android_ver
 from app.extensions import db
-from app.blueprints.reservation.schemas import ReservationResponseSchema, ReservationListSchema, ReservationRequestSchema, ReservationByUserSchema
+from app.blueprints.reservation.schemas import STATS_DAYS_MAX
 from app.models.user import User
 from app.models.room import Room
-from app.models.reservation import Reservation, StatusEnum
+from app.models.reservation import Reservation, StatusEnum, ACTIVE_STATUSES
+from app.models.association_tables import reservation_room
+from app.models.daily_stats import DailyStats
+from app.cache import invalidate
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, update, and_, or_, func, literal
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import selectinload
+from datetime import date, timedelta
+import base64
+import numpy as np
+
+class BookingConflict(Exception):
+    pass
 
 class ReservationService:
 
+    @staticmethod
+    def claim_rooms(rooms):
+        # Optimista zárolás: a szoba verziója csak akkor nő, ha az ellenőrzés óta senki más nem foglalta
+        for room in rooms:
+            claimed = db.session.execute(
+                update(Room)
+                .where(Room.id == room.id, Room.version == room.version)
+                .values(version=Room.version + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if claimed != 1:
+                raise BookingConflict(f"Room number {room.number} was booked concurrently, please try again")
+
+    @staticmethod
+    def room_rows(reservation_id, rooms):
+        # Kapcsolósorok a foglaláskori éjszakai árral és szobatípussal: a napi összesítő és a számla
+        # ezekből számol, így a szoba későbbi ár- vagy típusváltozása nem írja át a foglalást
+        return [{
+            "reservation_id": reservation_id,
+            "room_id": room.id,
+            "price": room.price,
+            "room_type_id": room.room_type_id
+        } for room in rooms]
+
     @staticmethod
     def add_reservation(request):
         try:
             user = User.query.get(request['user'])
             if not user:
                 return False, "Invalid user"
+            if request['start_date'] >= request['end_date']:
+                return False, "The start date must be earlier than the end date!"
+            # Ismétlődő szobaszám egyszer számít, különben kétszer foglalnánk (és ütközne önmagával)
+            room_numbers = list(dict.fromkeys(request['room_numbers']))
+            rooms = db.session.execute(
+                Room.available_between(request['start_date'], request['end_date']).filter(
+                    Room.number.in_(room_numbers)
+                )
+            ).scalars().all()
+            rooms_by_number = {room.number: room for room in rooms}
+
             selected_rooms = []
-            for room_number_request in request['room_numbers']:
-                rooms = db.session.query(Room).filter(
-                    and_(
-                        Room.number == room_number_request,
-                        Room.is_available == True
-                    )
-                ).all()
-                
-                if not rooms:
+            for room_number_request in room_numbers:
+                if room_number_request not in rooms_by_number:
                     return False, f"Room number {room_number_request} is not available or does not exist"
-            
-                selected_rooms.extend(rooms)
+                selected_rooms.append(rooms_by_number[room_number_request])
+
+            if request['room_types']:
+                quantities = {}
+                for item in request['room_types']:
+                    quantities[item['room_type_id']] = quantities.get(item['room_type_id'], 0) + item['quantity']
+                allocated = db.session.execute(
+                    Room.allocate(request['start_date'], request['end_date'], quantities, room_numbers)
+                ).scalars().all()
+                for room_type_id, quantity in quantities.items():
+                    if sum(1 for room in allocated if room.room_type_id == room_type_id) < quantity:
+                        return False, f"Not enough free rooms of room type {room_type_id}"
+                selected_rooms.extend(allocated)
+
+            if not selected_rooms:
+                return False, "No room numbers or room types given!"
 
+            ReservationService.claim_rooms(selected_rooms)
             reservation = Reservation(
                 start_date=request['start_date'],
                 end_date=request['end_date'],
                 reservation_date=request['reservation_date'],
                 user=user
             )
-        
-            reservation.rooms.extend(selected_rooms)
-        
-            for room in selected_rooms:
-                room.is_available = False
             
             db.session.add(reservation)
+            db.session.flush()
+            db.session.execute(insert(reservation_room), ReservationService.room_rows(reservation.id, selected_rooms))
+            DailyStats.apply(Reservation.id == reservation.id)
+            invalidate("availability")
             db.session.commit()
         
-            return True, ReservationResponseSchema().dump(reservation)
+            return True, reservation
         
+        except BookingConflict:
+            db.session.rollback()
+            raise
+        except OperationalError as ex:
+            # SQLite "database is locked" / szerializációs hiba: párhuzamos foglalás vesztese
+            print(ex)
+            db.session.rollback()
+            raise BookingConflict("The rooms were booked concurrently, please try again")
         except Exception as ex:
             print(ex)
             db.session.rollback()
             return False, "reservation_add() error!"
     
     @staticmethod
-    def reservation_list_all():
-        reservations = db.session.execute(select(Reservation)).scalars().all()
-        return True,ReservationListSchema().dump(reservations, many=True)
+    def add_reservation_batch(request):
+        try:
+            items = request['reservations']
+            results = [{"index": i, "success": False, "reservation_id": None, "message": ""} for i in range(len(items))]
+
+            # Felhasználók, szobák és a meglévő foglalások betöltése egy-egy lekérdezéssel
+            user_ids = set(db.session.execute(
+                select(User.id).where(User.id.in_({item.get('user') for item in items}))
+            ).scalars())
+            rooms_by_number = {room.number: room for room in db.session.execute(
+                select(Room).where(
+                    Room.is_available.is_(True),
+                    Room.number.in_({number for item in items for number in item.get('room_numbers', [])})
+                )
+            ).scalars()}
+
+            dated = [item for item in items if item.get('start_date') and item.get('end_date')]
+            booked = {}
+            if dated and rooms_by_number:
+                for room_id, start_date, end_date in db.session.execute(
+                    select(reservation_room.c.room_id, Reservation.start_date, Reservation.end_date).join(
+                        Reservation, Reservation.id == reservation_room.c.reservation_id
+                    ).where(
+                        Reservation.end_date > min(item['start_date'] for item in dated),
+                        Reservation.start_date < max(item['end_date'] for item in dated),
+                        Reservation.status.in_(ACTIVE_STATUSES),
+                        reservation_room.c.room_id.in_([room.id for room in rooms_by_number.values()])
+                    )
+                ):
+                    booked.setdefault(room_id, []).append((start_date, end_date))
+
+            # Ellenőrzés a meglévő és a kötegben korábban elfogadott foglalások ellen is
+            accepted = []
+            for result, item in zip(results, items):
+                if item.get('user') not in user_ids:
+                    result["message"] = "Invalid user"
+                    continue
+                if not (item.get('start_date') and item.get('end_date')) or item['start_date'] >= item['end_date']:
+                    result["message"] = "The start date must be earlier than the end date!"
+                    continue
+                if not item.get('room_numbers'):
+                    result["message"] = "No room numbers given!"
+                    continue
+                room_numbers = list(dict.fromkeys(item['room_numbers']))
+                missing = [number for number in room_numbers if number not in rooms_by_number]
+                if missing:
+                    result["message"] = f"Room number {missing[0]} is not available or does not exist"
+                    continue
+                rooms = [rooms_by_number[number] for number in room_numbers]
+                taken = [room.number for room in rooms if any(
+                    start < item['end_date'] and end > item['start_date'] for start, end in booked.get(room.id, [])
+                )]
+                if taken:
+                    result["message"] = f"Room number {taken[0]} is not available or does not exist"
+                    continue
+                for room in rooms:
+                    booked.setdefault(room.id, []).append((item['start_date'], item['end_date']))
+                accepted.append((result, item, rooms))
+
+            if accepted:
+                ReservationService.claim_rooms({room.id: room for _, _, rooms in accepted for room in rooms}.values())
+                reservation_ids = db.session.execute(
+                    insert(Reservation).returning(Reservation.id, sort_by_parameter_order=True),
+                    [{
+                        "user_id": item['user'],
+                        "start_date": item['start_date'],
+                        "end_date": item['end_date'],
+                        "reservation_date": item.get('reservation_date') or date.today()
+                    } for _, item, _ in accepted]
+                ).scalars().all()
+                db.session.execute(insert(reservation_room), [
+                    row for reservation_id, (_, _, rooms) in zip(reservation_ids, accepted)
+                    for row in ReservationService.room_rows(reservation_id, rooms)
+                ])
+                DailyStats.apply(Reservation.id.in_(reservation_ids))
+                invalidate("availability")
+                db.session.commit()
+                for reservation_id, (result, _, _) in zip(reservation_ids, accepted):
+                    result.update(success=True, reservation_id=reservation_id, message="OK")
+
+            return True, {"created": len(accepted), "results": results}
+
+        except BookingConflict:
+            db.session.rollback()
+            raise
+        except OperationalError as ex:
+            print(ex)
+            db.session.rollback()
+            raise BookingConflict("The rooms were booked concurrently, please try again")
+        except Exception as ex:
+            print(ex)
+            db.session.rollback()
+            return False, "reservation_add_batch() error!"
+
+    @staticmethod
+    def encode_cursor(reservation):
+        return base64.urlsafe_b64encode(f"{reservation.start_date.isoformat()}|{reservation.id}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        start_date, rid = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(start_date), int(rid)
+
+    @staticmethod
+    def paginate(query, request):
+        # Keyset lapozás (start_date, id) szerint: a következő oldal a kurzor utáni soroktól indul
+        if "start" in request:
+            query = query.where(Reservation.end_date > request["start"])
+        if "end" in request:
+            query = query.where(Reservation.start_date < request["end"])
+        if "cursor" in request:
+            try:
+                start_date, rid = ReservationService.decode_cursor(request["cursor"])
+            except (ValueError, UnicodeDecodeError):
+                return False, "Invalid cursor!"
+            query = query.where(or_(
+                Reservation.start_date > start_date,
+                and_(Reservation.start_date == start_date, Reservation.id > rid)
+            ))
+
+        # ORM objektumok nélkül: a foglalások oszlopai, majd a szobaszámok egyetlen IN lekérdezéssel
+        limit = request["limit"]
+        rows = db.session.execute(
+            query.with_only_columns(
+                Reservation.id,
+                Reservation.start_date,
+                Reservation.end_date,
+                Reservation.reservation_date,
+                Reservation.status
+            ).order_by(Reservation.start_date, Reservation.id).limit(limit + 1)
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = ReservationService.encode_cursor(rows[-1])
+
+        rooms = {}
+        if rows:
+            for reservation_id, number in db.session.execute(
+                select(reservation_room.c.reservation_id, Room.number).join(
+                    Room, Room.id == reservation_room.c.room_id
+                ).where(reservation_room.c.reservation_id.in_([row.id for row in rows]))
+            ):
+                rooms.setdefault(reservation_id, []).append({"number": number})
+        items = [{
+            "id": row.id,
+            "start_date": row.start_date,
+            "end_date": row.end_date,
+            "reservation_date": row.reservation_date,
+            "status": row.status,
+            "rooms": rooms.get(row.id, []),
+        } for row in rows]
+        return True, {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def reservation_list_all(request):
+        query = select(Reservation)
+        if "status" in request:
+            query = query.where(Reservation.status == request["status"])
+        return ReservationService.paginate(query, request)
 
     @staticmethod
-    def serach_reservation_by_room(rid):
-        reservations = db.session.execute(
-            select(Reservation).filter(Reservation.rooms.any(Room.number == rid))
-        ).scalars().all()
-        if not reservations:
+    def serach_reservation_by_room(rid, request):
+        query = select(Reservation).where(Reservation.id.in_(
+            select(reservation_room.c.reservation_id).join(
+                Room, Room.id == reservation_room.c.room_id
+            ).where(Room.number == rid)
+        ))
+        if "status" in request:
+            query = query.where(Reservation.status == request["status"])
+        success, response = ReservationService.paginate(query, request)
+        if success and not response["items"] and "cursor" not in request:
             return False, "Reservation not found!"
-        return True,ReservationListSchema().dump(reservations, many=True)
+        return success, response
 
     @staticmethod
     def serach_reservation_by_id(rid):
-        reservation = db.session.execute(select(Reservation).filter(Reservation.id==rid)).scalar_one_or_none()
+        reservation = db.session.execute(
+            select(Reservation).filter(Reservation.id==rid).options(selectinload(Reservation.rooms))
+        ).scalar_one_or_none()
         if reservation is None:
             return False, "Reservation not found!"
         #return True, ReservationService.serialize_reservations(reservation)
-        return True,ReservationListSchema().dump(reservation)
+        return True, reservation
 
     @staticmethod
-    def serach_reservation_by_user(uid):
-        reservations = db.session.execute(select(Reservation).filter(
-            and_(
-                Reservation.user_id==uid,
-                or_(
-                    Reservation.status == "Depending",
-                    Reservation.status == "Success"
-                )
-            )
-        )).scalars().all()
-        if not reservations:
+    def serach_reservation_by_user(uid, request):
+        query = select(Reservation).filter(Reservation.user_id==uid)
+        if "status" in request:
+            query = query.where(Reservation.status == request["status"])
+        else:
+            query = query.where(or_(
+                Reservation.status == "Depending",
+                Reservation.status == "Success"
+            ))
+        success, response = ReservationService.paginate(query, request)
+        if success and not response["items"] and "cursor" not in request:
             return False, "User not found!"
-        return True,ReservationByUserSchema().dump(reservations, many=True)
+        return success, response
 
     
 
+    @staticmethod
+    def reservation_calendar(request):
+        start = request["start"]
+        days = request["days"]
+        end = start + timedelta(days=days)
+
+        rooms = db.session.execute(select(Room.id, Room.number).order_by(Room.number)).all()
+        bookings = db.session.execute(
+            select(
+                reservation_room.c.room_id,
+                Reservation.id,
+                Reservation.start_date,
+                Reservation.end_date
+            ).join(
+                Reservation, Reservation.id == reservation_room.c.reservation_id
+            ).where(
+                Reservation.end_date > start,
+                Reservation.start_date < end,
+                Reservation.status.in_(ACTIVE_STATUSES)
+            )
+        ).all()
+
+        # Szobák x napok rács, a cellában a foglalás id-ja (0 = szabad)
+        grid = np.zeros((len(rooms), days), dtype=np.int64)
+        if bookings:
+            row_of = {room_id: row for row, (room_id, _) in enumerate(rooms)}
+            rows = np.array([row_of[b[0]] for b in bookings], dtype=np.int64)
+            ids = np.array([b[1] for b in bookings], dtype=np.int64)
+            first = np.array([max((b[2] - start).days, 0) for b in bookings], dtype=np.int64)
+            last = np.array([min((b[3] - start).days, days) for b in bookings], dtype=np.int64)
+
+            # Minden foglalás összes napját egyszerre festjük be
+            lengths = last - first
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            grid[np.repeat(rows, lengths), np.repeat(first, lengths) + offsets] = np.repeat(ids, lengths)
+
+        # Run-length kódolás soronként: ahol az érték változik, ott kezdődik új szakasz
+        change = np.ones((len(rooms), days), dtype=bool)
+        change[:, 1:] = grid[:, 1:] != grid[:, :-1]
+        calendar = []
+        for row, (_, number) in enumerate(rooms):
+            run_starts = np.flatnonzero(change[row])
+            run_lengths = np.diff(np.append(run_starts, days))
+            calendar.append({
+                "number": number,
+                "runs": np.column_stack((grid[row, run_starts], run_lengths)).tolist()
+            })
+
+        return True, {"start": start, "days": days, "rooms": calendar}
+
+    @staticmethod
+    def reservation_stats(request):
+        start, end = request["start"], request["end"]
+        if start >= end:
+            return False, "The start date must be earlier than the end date!"
+        if (end - start).days > STATS_DAYS_MAX:
+            return False, f"The period can be at most {STATS_DAYS_MAX} days!"
+        by_type = request["by_type"] or "room_type_id" in request
+
+        # Csak a napi összesítőt és a (kicsi) szobatörzset olvassuk, a foglalásokat nem
+        inventory_query = select(Room.room_type_id, func.count()).where(Room.is_available.is_(True))
+        stats_query = select(
+            DailyStats.day,
+            DailyStats.room_type_id if by_type else literal(None),
+            func.sum(DailyStats.rooms_sold),
+            func.sum(DailyStats.revenue)
+        ).where(DailyStats.day >= start, DailyStats.day < end)
+        if "room_type_id" in request:
+            inventory_query = inventory_query.where(Room.room_type_id == request["room_type_id"])
+            stats_query = stats_query.where(DailyStats.room_type_id == request["room_type_id"])
+        if by_type:
+            inventory = dict(db.session.execute(inventory_query.group_by(Room.room_type_id)).all())
+            stats_query = stats_query.group_by(DailyStats.day, DailyStats.room_type_id)
+        else:
+            inventory = {None: db.session.execute(inventory_query.with_only_columns(func.count())).scalar_one()}
+            stats_query = stats_query.group_by(DailyStats.day)
+        sold = {(day, room_type_id): (rooms_sold, revenue) for day, room_type_id, rooms_sold, revenue in db.session.execute(stats_query)}
+
+        room_types = sorted(set(inventory) | {room_type_id for _, room_type_id in sold}, key=lambda x: x or 0)
+        days = []
+        for offset in range((end - start).days):
+            day = start + timedelta(days=offset)
+            for room_type_id in room_types:
+                rooms = inventory.get(room_type_id, 0)
+                rooms_sold, revenue = sold.get((day, room_type_id), (0, 0))
+                days.append({
+                    "day": day.isoformat(),
+                    "room_type_id": room_type_id,
+                    "rooms": rooms,
+                    "rooms_sold": rooms_sold,
+                    "revenue": revenue,
+                    "occupancy": rooms_sold / rooms if rooms else 0,
+                    "adr": revenue / rooms_sold if rooms_sold else 0,
+                    "revpar": revenue / rooms if rooms else 0,
+                })
+
+        return True, {"start": start, "end": end, "days": days}
+
     @staticmethod
     def update_reservation(rid, request):
         try:
             reservation = db.session.get(Reservation, rid)
             if reservation:
-                rooms = db.session.query(Room).filter(Room.number.in_(request['room_numbers'])).all()
+                room_numbers = set(request['room_numbers'])
+                rooms = db.session.query(Room).filter(Room.number.in_(room_numbers)).all()
                 
                 #if not user or 
-                if len(rooms) != len(request['room_numbers']):
+                if len(rooms) != len(room_numbers):
                     return False, "Invalid user or room numberss"
-                    
+
+                booked = db.session.execute(
+                    Reservation.booked_room_ids(request["start_date"], request["end_date"], exclude_id=rid).filter(
+                        reservation_room.c.room_id.in_([room.id for room in rooms])
+                    )
+                ).scalars().all()
+                if request["status"] in ACTIVE_STATUSES:
+                    if booked:
+                        return False, "One or more rooms are already booked for this period!"
+                    ReservationService.claim_rooms(rooms)
+
+                # Napi összesítő: a régi állapot kivonása, majd az új hozzáadása
+                DailyStats.apply(Reservation.id == rid, -1)
                 reservation.start_date = request["start_date"]
                 reservation.end_date = request["end_date"]
                 reservation.reservation_date = request["reservation_date"]
-                reservation.rooms = rooms
+                # A megmaradó szobák a foglaláskori árukat tartják meg, csak az újak kapják a mostanit
+                kept = set(db.session.execute(
+                    select(reservation_room.c.room_id).where(reservation_room.c.reservation_id == rid)
+                ).scalars())
+                db.session.execute(reservation_room.delete().where(
+                    reservation_room.c.reservation_id == rid,
+                    reservation_room.c.room_id.not_in([room.id for room in rooms])
+                ))
+                added = [room for room in rooms if room.id not in kept]
+                if added:
+                    db.session.execute(insert(reservation_room), ReservationService.room_rows(rid, added))
                 reservation.status = request["status"]
+                db.session.flush()
+                DailyStats.apply(Reservation.id == rid)
+                invalidate("availability")
                 db.session.commit()
-                return True, ReservationResponseSchema().dump(reservation)
+                return True, reservation
             return False, "Reservation not found!"
             
+        except BookingConflict:
+            db.session.rollback()
+            raise
+        except OperationalError as ex:
+            print(ex)
+            db.session.rollback()
+            raise BookingConflict("The rooms were booked concurrently, please try again")
         except Exception as ex:
             print(ex)
             return False, "Reservation_update() error!"
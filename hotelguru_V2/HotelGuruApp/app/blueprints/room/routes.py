@@ -1,14 +1,19 @@
 from app.blueprints.room import bp
-from app.blueprints.room.schemas import RoomSchema, RoomRequestSchema, RoomResponseSchema, AllRoomListSchema, RoomUpdateSchema
+from app.blueprints.room.schemas import RoomSchema, RoomRequestSchema, RoomResponseSchema, AllRoomListSchema, RoomUpdateSchema, RoomAvailabilityQuerySchema, RoomTypeListSchema
 from app.blueprints.room.service import RoomService
 from apiflask.fields import String, Integer
 from apiflask import HTTPError
+from app.conditional import etag
+from app.cache import cached
+from app.replicas import replica
 
 @bp.route('/')
 def index():
     return 'This is The Room Blueprint'
 
 @bp.get('/list/')
+@replica
+@cached("rooms")
 @bp.output(AllRoomListSchema(many = True))
 def room_list_all():
     success, response = RoomService.room_list_all()
@@ -16,7 +21,30 @@ def room_list_all():
         return response, 200
     raise HTTPError(message=response, status_code=400)
 
+@bp.get('/types')
+@replica
+@etag("room_types")
+@bp.output(RoomTypeListSchema(many = True))
+def room_type_list_all():
+    success, response = RoomService.room_type_list_all()
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
+@bp.get('/available')
+@replica
+@cached("availability")
+@bp.input(RoomAvailabilityQuerySchema, location="query")
+@bp.output(AllRoomListSchema(many = True))
+def room_available(query_data):
+    success, response = RoomService.room_available(query_data)
+    if success:
+        return response, 200
+    raise HTTPError(message=response, status_code=400)
+
 @bp.get('/show/<int:rid>')
+@replica
+@cached("room:{rid}")
 @bp.output(RoomSchema)
 def selected_room(rid):
     success, response = RoomService.selected_room(rid)
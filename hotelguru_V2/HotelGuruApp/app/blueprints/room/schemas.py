@@ -1,5 +1,5 @@
 from marshmallow import Schema, fields
-from apiflask.fields import String, Email, Nested, Integer, List, Boolean, Float
+from apiflask.fields import String, Email, Nested, Integer, List, Boolean, Float, Date
 from apiflask.validators import Length, OneOf, Email
 from app.models.room import Room
 
@@ -7,6 +7,10 @@ class RoomTypeSchema(Schema):
     #id = fields.Integer()
     name = fields.String()
 
+class RoomTypeListSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+
 class RoomRequestSchema(Schema):
     number = fields.Integer()
     floor = fields.Integer()
@@ -34,6 +38,12 @@ class RoomResponseSchema(Schema):
 
 
 
+class RoomAvailabilityQuerySchema(Schema):
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
+    room_type = fields.Integer()
+
+
 class AllRoomListSchema(Schema):
     number = fields.Integer()
     floor = fields.Integer()
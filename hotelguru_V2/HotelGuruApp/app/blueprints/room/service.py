@@ -1,11 +1,13 @@
 from platform import android_ver
 from app.extensions import db
-from app.blueprints.room.schemas import RoomResponseSchema, RoomRequestSchema, RoomSchema, AllRoomListSchema
 
 #from app.models.room_type import Roomtype
 from app.models.room import Room
+from app.models.room_type import RoomType
+from app.cache import invalidate
 
 from sqlalchemy import select, and_
+from sqlalchemy.orm import joinedload
 
 class RoomService:
     
@@ -15,18 +17,43 @@ class RoomService:
            
             room = Room(**request)
             db.session.add(room)
+            invalidate("rooms", "availability", f"room:{room.number}")
             db.session.commit()
             
         except Exception as ex:
             print(ex)
             return False, "room_add() error!"
-        return True, RoomResponseSchema().dump(room)
+        return True, room
     
     @staticmethod
     def room_list_all():
-        rooms = db.session.execute( select(Room).filter(Room.is_available.is_(True))).scalars()
-        return True, AllRoomListSchema().dump(rooms, many = True)
+        # Csak a séma oszlopai, ORM objektumok és identity map nélkül
+        rows = db.session.execute(
+            select(Room.number, Room.floor, Room.name, Room.price, RoomType.name).join(
+                RoomType, RoomType.id == Room.room_type_id
+            ).filter(Room.is_available.is_(True))
+        ).tuples()
+        rooms = [
+            {"number": number, "floor": floor, "name": name, "price": price, "room_type": {"name": room_type}}
+            for number, floor, name, price, room_type in rows
+        ]
+        return True, rooms
     
+    @staticmethod
+    def room_type_list_all():
+        room_types = db.session.execute(select(RoomType).order_by(RoomType.id)).scalars()
+        return True, room_types
+
+    @staticmethod
+    def room_available(request):
+        if request["start"] >= request["end"]:
+            return False, "The start date must be earlier than the end date!"
+        rooms = db.session.execute(
+            Room.available_between(request["start"], request["end"], request.get("room_type"))
+            .options(joinedload(Room.room_type))
+        ).scalars()
+        return True, rooms
+
     @staticmethod
     def selected_room(rid):
         room = db.session.execute(
@@ -35,9 +62,9 @@ class RoomService:
                     Room.number==rid,
                     Room.is_available.is_(True)
                 )
-            )
+            ).options(joinedload(Room.room_type))
         ).scalar_one_or_none()       
-        return True, RoomSchema().dump(room)
+        return True, room
 
     @staticmethod
     def room_update(rid, request):
@@ -49,10 +76,11 @@ class RoomService:
                 room.price = float(request["price"])
                 room.is_available = bool(request["is_available"])
                 room.room_type_id = int(request["room_type_id"])
+                invalidate("rooms", "availability", f"room:{room.number}")
                 db.session.commit()
             
         except Exception as ex:
             print(ex)
             return False, "room_update() error!"
-        return True, RoomResponseSchema().dump(room)
+        return True, room
 
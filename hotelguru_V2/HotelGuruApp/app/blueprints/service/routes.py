@@ -4,12 +4,18 @@ from app.blueprints.service.service import ServiceService
 
 from apiflask.fields import String, Integer
 from apiflask import HTTPError
+from app.auth import auth
+from app.conditional import etag
+from app.cache import cached
+from app.replicas import replica
 
 @bp.route('/')
 def index():
     return 'This is The Service Blueprint'
 
 @bp.get('/list')
+@replica
+@etag("services")
 @bp.output(ServiceListSchema(many = True))
 def service_list_all():
     success, response = ServiceService.service_list_all()
@@ -18,6 +24,9 @@ def service_list_all():
     raise HTTPError(message=response, status_code=400)
 
 @bp.get('/list/<int:sid>')
+@replica
+@etag("services")
+@cached("service:{sid}")
 @bp.output(ServiceListSchema)
 def service_by_id(sid):
     success, response = ServiceService.service_by_id(sid)
@@ -26,6 +35,7 @@ def service_by_id(sid):
     raise HTTPError(message=response, status_code=400)
 
 @bp.post('/add')
+@bp.auth_required(auth, roles=["Administrator"])
 @bp.input(ServiceRequestSchema, location="json")
 @bp.output(ServiceResponseSchema)
 def service_add_new(json_data):
@@ -36,6 +46,7 @@ def service_add_new(json_data):
 
 
 @bp.put('/update/<int:sid>')
+@bp.auth_required(auth, roles=["Administrator"])
 @bp.input(ServiceUpdateSchema, location="json")
 @bp.output(ServiceResponseSchema)
 def service_update(sid, json_data):
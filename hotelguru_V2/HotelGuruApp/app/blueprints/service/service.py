@@ -1,7 +1,8 @@
 from app.extensions import db
-from app.blueprints.service.schemas import ServiceRequestSchema, ServiceResponseSchema, ServiceListSchema
 
 from app.models.service import Service
+from app.conditional import bump_version
+from app.cache import invalidate
 
 from sqlalchemy import select, and_
 
@@ -12,17 +13,21 @@ class ServiceService:
         try:
             service = Service(**request)
             db.session.add(service)
+            bump_version("services")
             db.session.commit()
             
         except Exception as ex:
             return False, "service_add() error!"
-        return True, ServiceResponseSchema().dump(service)
+        return True, service
 
     
     @staticmethod
     def service_list_all():
-        service = db.session.execute( select(Service)).scalars()
-        return True, ServiceListSchema().dump(service, many = True)
+        # Csak a séma oszlopai, ORM objektumok és identity map nélkül
+        service = db.session.execute(
+            select(Service.id, Service.name, Service.description, Service.price, Service.deleted)
+        ).mappings()
+        return True, service
 
 
     @staticmethod
@@ -30,7 +35,7 @@ class ServiceService:
         service = db.session.execute(select(Service).filter(Service.id==sid)).scalar_one_or_none()
         if service is None:
             return False, "Service not found!"
-        return True, ServiceListSchema().dump(service)
+        return True, service
     
 
     @staticmethod
@@ -42,11 +47,13 @@ class ServiceService:
                 service.description = request["description"]
                 service.price = float(request["price"])
                 service.deleted = request["deleted"]
+                bump_version("services")
+                invalidate(f"service:{sid}")
                 db.session.commit()
             
         except Exception as ex:
             return False, "service_update() error!"
-        return True, ServiceResponseSchema().dump(service)
+        return True, service
 
 
     # @staticmethod
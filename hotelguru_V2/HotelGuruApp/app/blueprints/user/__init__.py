@@ -1,5 +1,5 @@
 from apiflask import APIBlueprint
 
-bp = APIBlueprint('user', __name__, tag="user")
+bp = APIBlueprint('user', __name__, tag="user", cli_group="user")
 
-from app.blueprints.user import routes
+from app.blueprints.user import routes, commands
@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+import click
+from flask import current_app
+from marshmallow import ValidationError
+from sqlalchemy import select, insert
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.blueprints.user import bp
+from app.blueprints.user.schemas import UserRequestSchema
+from app.models.address import Address
+from app.models.role import Role
+from app.models.user import User, UserRole
+
+# CSV fejléc; NDJSON esetén a /registrate kérés törzse soronként
+CSV_COLUMNS = ["name", "email", "password", "phone", "city", "street", "postalcode"]
+# A users és addresses oszlopai NOT NULL-ok: egy hiányos sor a teljes köteg beszúrását buktatná
+REQUIRED_FIELDS = ["name", "email", "password", "phone"]
+REQUIRED_ADDRESS_FIELDS = ["city", "street", "postalcode"]
+
+
+def read_rows(stream, file_format):
+    if file_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {
+                "name": row.get("name"),
+                "email": row.get("email"),
+                "password": row.get("password"),
+                "phone": row.get("phone"),
+                "address": {"city": row.get("city"), "street": row.get("street"), "postalcode": row.get("postalcode")},
+            }
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def import_batch(rows, pool, role_id, first_row):
+    schema = UserRequestSchema()
+    users = {}
+    invalid = 0
+    for offset, row in enumerate(rows):
+        try:
+            user = schema.load(row)
+            missing = [field for field in REQUIRED_FIELDS if user.get(field) in (None, "")]
+            missing += [f"address.{field}" for field in REQUIRED_ADDRESS_FIELDS
+                        if (user.get("address") or {}).get(field) in (None, "")]
+            if missing:
+                raise ValidationError(f"Missing {', '.join(missing)}")
+        except ValidationError as ex:
+            invalid += 1
+            click.echo(f"row {first_row + offset}: {ex.messages}", err=True)
+            continue
+        # Kötegen belüli ismétlődésnél az első sor marad
+        users.setdefault(user["email"], user)
+
+    # Meglévő e-mail címek kiszűrése egyetlen halmazlekérdezéssel
+    existing = set(db.session.execute(
+        select(User.email).where(User.email.in_([user["email"] for user in users.values()]))
+    ).scalars())
+    users = [user for user in users.values() if user["email"] not in existing]
+    duplicates = len(rows) - invalid - len(users)
+    if not users:
+        return 0, duplicates, invalid
+
+    hash_password = partial(
+        generate_password_hash,
+        method=current_app.config["PASSWORD_HASH_METHOD"],
+        salt_length=current_app.config["PASSWORD_HASH_SALT_LENGTH"]
+    )
+    hashes = pool.map(hash_password, [user["password"] for user in users], chunksize=16)
+
+    address_ids = db.session.execute(
+        insert(Address).returning(Address.id, sort_by_parameter_order=True),
+        [user["address"] for user in users]
+    ).scalars().all()
+    user_ids = db.session.execute(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [{
+            "name": user["name"],
+            "email": user["email"],
+            "password": pwhash,
+            "phone": user["phone"],
+            "address_id": address_id,
+        } for user, pwhash, address_id in zip(users, hashes, address_ids)]
+    ).scalars().all()
+    db.session.execute(insert(UserRole), [{"user_id": user_id, "role_id": role_id} for user_id in user_ids])
+    db.session.commit()
+    return len(users), duplicates, invalid
+
+
+@bp.cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(["csv", "ndjson"]), help="Default: from the file extension.")
+@click.option("--batch-size", default=1000, show_default=True)
+@click.option("--workers", default=os.cpu_count(), show_default=True, help="Password hashing processes.")
+@click.option("--role", default="Guest", show_default=True, help="Role given to every imported user.")
+def import_command(path, file_format, batch_size, workers, role):
+    """Import users with addresses from CSV or NDJSON."""
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    role_id = db.session.execute(select(Role.id).filter_by(name=role)).scalar_one_or_none()
+    if role_id is None:
+        raise click.ClickException(f"Role {role} not found!")
+
+    started = time.perf_counter()
+    imported = duplicates = invalid = read = 0
+    with open(path, encoding="utf-8-sig", newline="") as stream, ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = read_rows(stream, file_format)
+        while batch := list(islice(rows, batch_size)):
+            done = import_batch(batch, pool, role_id, read + 1)
+            imported, duplicates, invalid = imported + done[0], duplicates + done[1], invalid + done[2]
+            read += len(batch)
+            click.echo(f"\r{read} rows read, {imported} imported", nl=False, err=True)
+    click.echo(err=True)
+
+    elapsed = time.perf_counter() - started
+    click.echo(f"imported={imported} duplicates={duplicates} invalid={invalid} "
+               f"elapsed={elapsed:.2f}s rate={read / elapsed if elapsed else 0:.0f} rows/s")
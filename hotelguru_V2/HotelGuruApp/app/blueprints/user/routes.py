@@ -1,7 +1,9 @@
 from flask import jsonify
 from app.blueprints.user import bp
-from app.blueprints.user.schemas import UserResponseSchema, UserRequestSchema, UserLoginSchema, RoleSchema, AddressSchema, UserUpdateSchema
+from app.blueprints.user.schemas import UserResponseSchema, UserRequestSchema, UserLoginSchema, RoleSchema, AddressSchema, UserUpdateSchema, UserLoginResponseSchema
 from app.blueprints.user.service import UserService
+from app.passwords import PasswordPoolBusy
+from app.conditional import etag
 from apiflask import HTTPError
 from apiflask.fields import String, Email, Nested, Integer, List
 
@@ -14,7 +16,10 @@ def index():
 @bp.input(UserRequestSchema, location="json")
 @bp.output(UserResponseSchema)
 def user_registrate(json_data):
-    success, response = UserService.user_registrate(json_data)
+    try:
+        success, response = UserService.user_registrate(json_data)
+    except PasswordPoolBusy as ex:
+        raise HTTPError(message=str(ex), status_code=503, headers={"Retry-After": "1"})
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
@@ -24,9 +29,12 @@ def user_registrate(json_data):
 @bp.post('/login')
 @bp.doc(tags=["user"])
 @bp.input(UserLoginSchema, location="json")
-@bp.output(UserResponseSchema)
+@bp.output(UserLoginResponseSchema)
 def user_login(json_data):
-    success, response = UserService.user_login(json_data)
+    try:
+        success, response = UserService.user_login(json_data)
+    except PasswordPoolBusy as ex:
+        raise HTTPError(message=str(ex), status_code=503, headers={"Retry-After": "1"})
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
@@ -34,6 +42,7 @@ def user_login(json_data):
 
 @bp.get('/roles')
 @bp.doc(tags=["user"])
+@etag("roles")
 @bp.output(RoleSchema(many=True))
 def user_list_roles():
     success, response = UserService.user_list_roles()
@@ -56,7 +65,10 @@ def user_list_user_roles(uid):
 @bp.input(UserUpdateSchema, location="json")
 @bp.output(UserResponseSchema)
 def update_user(uid, json_data):
-    success, response = UserService.update_user(uid, json_data)
+    try:
+        success, response = UserService.update_user(uid, json_data)
+    except PasswordPoolBusy as ex:
+        raise HTTPError(message=str(ex), status_code=503, headers={"Retry-After": "1"})
     if success:
         return response, 200
     raise HTTPError(message=response, status_code=400)
\ No newline at end of file
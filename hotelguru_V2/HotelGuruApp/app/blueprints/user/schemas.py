@@ -31,6 +31,11 @@ class UserResponseSchema(Schema):
 class UserLoginSchema(Schema):
     email = String(validate=Email())
     password = fields.String()
+
+class UserLoginResponseSchema(UserResponseSchema):
+    roles = fields.List(fields.String())
+    token = fields.String()
+    expires_in = fields.Integer()
     
 
 class RoleSchema(Schema):
@@ -1,10 +1,13 @@
 from app.extensions import db
-from app.blueprints.user.schemas import UserResponseSchema, RoleSchema
 from app.models.user import User
 from app.models.address import Address
 from app.models.role import Role
+from app.auth import issue_token
+from app.passwords import PasswordPoolBusy
+from flask import current_app
 
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 class UserService:
     
@@ -22,35 +25,55 @@ class UserService:
                 )
             db.session.add(user)
             db.session.commit()
+        except PasswordPoolBusy:
+            db.session.rollback()
+            raise
         except KeyError as ke:
             return False, f"Missing required field: {str(ke)}"
         except ValueError as ve:
             return False, f"Invalid data format: {str(ve)}"
         except Exception as ex:
             return False, f"Registration error: {str(ex)}"
-        return True, UserResponseSchema().dump(user)
+        return True, user
         
     @staticmethod
     def user_login(request):
         try:
-           user = db.session.execute(select(User).filter_by(email=request["email"])).scalar_one()
+           user = db.session.execute(
+               select(User).filter_by(email=request["email"]).options(selectinload(User.roles))
+           ).scalar_one()
            if not user.check_password(request["password"]):
             return False, "Incorrect e-mail or password!"
+           # Elavult hash paraméterek: a most ismert jelszóval újrahasheljük
+           if user.password_needs_rehash():
+               user.set_password(request["password"])
+               db.session.commit()
+        except PasswordPoolBusy:
+            db.session.rollback()
+            raise
         except Exception as ex:
             return False, "Incorrect Login data!"
-        return True, UserResponseSchema().dump(user)
+        return True, {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "address": user.address,
+            "roles": [role.name for role in user.roles],
+            "token": issue_token(user),
+            "expires_in": current_app.config["AUTH_TOKEN_MAX_AGE"],
+        }
 
     @staticmethod
     def user_list_roles():
         roles = db.session.query(Role).all()
-        return True, RoleSchema().dump(obj=roles, many=True)
+        return True, roles
     
     @staticmethod
     def list_user_roles(uid):
-        user = db.session.get(User, uid)
+        user = db.session.get(User, uid, options=[selectinload(User.roles)])
         if user is None:
             return False, "User not found!"
-        return True, RoleSchema().dump(obj=user.roles, many=True)
+        return True, user.roles
 
     
     @staticmethod
@@ -74,12 +97,15 @@ class UserService:
                     user.phone = request["phone_number"]
                 
                 if "password" in request:
-                    user.set_password(user.password)
+                    user.set_password(request["password"])
                 
                 db.session.commit()
-                return True, UserResponseSchema().dump(user)
+                return True, user
             return False, "User not found!"
             
+        except PasswordPoolBusy:
+            db.session.rollback()
+            raise
         except Exception as ex:
             print(ex)
             return False, "User_update() error!"
\ No newline at end of file
@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+
+class MemoryCache:
+    # Folyamaton belüli LRU lejárati idővel; címkénként nyilvántartjuk a kulcsokat az érvénytelenítéshez
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, tags):
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def delete_tags(self, tags):
+        with self.lock:
+            for tag in tags:
+                for key in self.tags.pop(tag, ()):
+                    self._remove(key)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                keys = self.tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.tags[tag]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SQLiteCache:
+    # Helyi fájlban tárolt, a workerek között közös gyorsítótár (WAL módban olvasás írás közben is megy)
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.local = threading.local()
+        with self.connection() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, expires REAL, mimetype TEXT, body BLOB);
+                CREATE INDEX IF NOT EXISTS ix_entries_expires ON entries (expires);
+                CREATE TABLE IF NOT EXISTS entry_tags (tag TEXT, key TEXT, PRIMARY KEY (tag, key));
+                CREATE INDEX IF NOT EXISTS ix_entry_tags_key ON entry_tags (key);
+            """)
+
+    def connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def reset_connections(self):
+        # Forkolt workerben: a szülő kapcsolata nem használható tovább
+        self.local = threading.local()
+
+    def get(self, key):
+        row = self.connection().execute(
+            "SELECT mimetype, body FROM entries WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return (row[1], row[0]) if row else None
+
+    def set(self, key, value, tags):
+        body, mimetype = value
+        now = time.time()
+        connection = self.connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM entry_tags WHERE key IN (SELECT key FROM entries WHERE expires <= ?)", (now,))
+            connection.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+            connection.execute("DELETE FROM entry_tags WHERE key = ?", (key,))
+            connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (key, now + self.ttl, mimetype, body))
+            connection.executemany("INSERT OR IGNORE INTO entry_tags VALUES (?, ?)", [(tag, key) for tag in tags])
+
+    def delete_tags(self, tags):
+        connection = self.connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            keys = [row[0] for tag in tags for row in connection.execute("SELECT key FROM entry_tags WHERE tag = ?", (tag,))]
+            connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+            connection.executemany("DELETE FROM entry_tags WHERE key = ?", [(key,) for key in keys])
+
+    def __len__(self):
+        return self.connection().execute("SELECT count(*) FROM entries").fetchone()[0]
+
+
+def cached(*tags):
+    # Válasz gyorsítótár: a címkék az útvonal paramétereivel formázhatók, pl. "room:{rid}"
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            state = current_app.extensions["response_cache"]
+            backend = state["backend"]
+            if backend is None:
+                return view(*args, **kwargs)
+
+            key = request.full_path
+            hit = backend.get(key)
+            if hit is not None:
+                state["hits"] += 1
+                response = current_app.response_class(hit[0], mimetype=hit[1])
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            state["misses"] += 1
+            response = make_response(view(*args, **kwargs))
+            # Replikáról olvasott választ nem tárolunk: az késhet az elsődlegeshez képest, és a
+            # commit utáni érvénytelenítés után is a régi adatot szolgálná ki (az írónak is)
+            if response.status_code == 200 and not response.is_streamed and "replica" not in db.session.info:
+                backend.set(key, (response.get_data(), response.mimetype), [tag.format(**kwargs) for tag in tags])
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate(*tags):
+    # Az érvénytelenítés a commit után történik, különben egy párhuzamos olvasó a régi adatot tenné vissza
+    db.session.info.setdefault("response_cache_tags", set()).update(tags)
+
+
+def flush_invalidations(session):
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        backend = current_app.extensions["response_cache"]["backend"]
+        if backend is not None:
+            backend.delete_tags(tags)
+
+
+def discard_invalidations(session):
+    session.info.pop("response_cache_tags", None)
+
+
+def cache_stats():
+    state = current_app.extensions["response_cache"]
+    backend = state["backend"]
+    lookups = state["hits"] + state["misses"]
+    return {
+        "backend": current_app.config["RESPONSE_CACHE_BACKEND"],
+        "pid": os.getpid(),
+        "hits": state["hits"],
+        "misses": state["misses"],
+        "hit_ratio": state["hits"] / lookups if lookups else 0,
+        "entries": len(backend) if backend is not None else 0,
+    }
+
+
+def init_cache(app):
+    app.config.setdefault("RESPONSE_CACHE_BACKEND", "sqlite")
+    app.config.setdefault("RESPONSE_CACHE_TTL", 60)
+    app.config.setdefault("RESPONSE_CACHE_SIZE", 1024)
+    app.config.setdefault("RESPONSE_CACHE_PATH", os.path.join(app.instance_path, "response_cache.db"))
+
+    kind = app.config["RESPONSE_CACHE_BACKEND"]
+    if kind == "memory":
+        backend = MemoryCache(app.config["RESPONSE_CACHE_SIZE"], app.config["RESPONSE_CACHE_TTL"])
+    elif kind == "sqlite":
+        os.makedirs(os.path.dirname(app.config["RESPONSE_CACHE_PATH"]), exist_ok=True)
+        backend = SQLiteCache(app.config["RESPONSE_CACHE_PATH"], app.config["RESPONSE_CACHE_TTL"])
+    else:
+        backend = None
+    # A számlálók folyamatonkéntiek
+    app.extensions["response_cache"] = {"backend": backend, "hits": 0, "misses": 0}
+
+    if not event.contains(db.session, "after_commit", flush_invalidations):
+        event.listen(db.session, "after_commit", flush_invalidations)
+        event.listen(db.session, "after_rollback", discard_invalidations)
@@ -0,0 +1,126 @@
+import zlib
+
+from flask import current_app, request
+
+# Opcionális kódolók: ha a csomag nincs telepítve, az adott kódolást nem ajánljuk fel
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def gzip_compressor(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def brotli_compressor(level):
+    compressor = brotli.Compressor(quality=level)
+
+    def compress(chunk):
+        # A brotli magától a végéig pufferelne: darabonkénti flush, hogy az első bájt hamar elinduljon
+        return compressor.process(chunk) + compressor.flush()
+
+    return compress, compressor.finish
+
+
+def zstd_compressor(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return compressor.compress, compressor.flush
+
+
+# Content-Encoding -> (kódoló, szint beállítás)
+ENCODERS = {
+    "gzip": (gzip_compressor, "COMPRESS_GZIP_LEVEL"),
+    "br": (brotli_compressor, "COMPRESS_BR_LEVEL"),
+    "zstd": (zstd_compressor, "COMPRESS_ZSTD_LEVEL"),
+}
+
+
+def available_encodings(names):
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return [name.strip() for name in names.split(",") if installed.get(name.strip())]
+
+
+def compress_chunks(chunks, encoding):
+    # A kódoló még a kérés alatt jön létre, a generátor már az app context nélkül fut
+    factory, level = ENCODERS[encoding]
+    compress, flush = factory(current_app.config[level])
+    return encode(chunks, compress, flush)
+
+
+def encode(chunks, compress, flush):
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield flush()
+
+
+def split(body, size):
+    for offset in range(0, len(body), size):
+        yield body[offset:offset + size]
+
+
+def compress_response(response):
+    # Kódolás a kliens Accept-Encoding fejléce szerint; azonos súlynál a beállított sorrend dönt
+    if (response.status_code < 200
+            or response.status_code in (204, 304)
+            or request.method == "HEAD"
+            or "Content-Encoding" in response.headers
+            or "no-transform" in response.headers.get("Cache-Control", "")
+            or not response.mimetype.startswith(COMPRESSIBLE_MIMETYPES)):
+        return response
+
+    config = current_app.config
+    if not response.is_streamed and response.calculate_content_length() < config["COMPRESS_MIN_SIZE"]:
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(current_app.extensions["compression"])
+    # Nagy lista: a @bp.output már a teljes törzset előállította, így csak a tömörítés és az átvitel
+    # darabolt (chunked), az első bájt a szerializálás után, de az egész tömörítése előtt indul
+    large = not response.is_streamed and response.calculate_content_length() > config["COMPRESS_STREAM_SIZE"]
+    if encoding is None:
+        if large:
+            response.response = split(response.get_data(), config["COMPRESS_CHUNK_SIZE"])
+            response.headers.pop("Content-Length", None)
+        return response
+
+    if response.is_streamed:
+        # Folyamatos export: a darabok tömörítve mennek tovább, pufferelés nélkül
+        response.response = compress_chunks(response.iter_encoded(), encoding)
+        response.headers.pop("Content-Length", None)
+    elif large:
+        response.response = compress_chunks(split(response.get_data(), config["COMPRESS_CHUNK_SIZE"]), encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        response.set_data(b"".join(compress_chunks([response.get_data()], encoding)))
+    response.headers["Content-Encoding"] = encoding
+
+    # A tömörített változat nem bájtazonos: az ETag gyenge lesz, az If-None-Match gyenge összevetéssel működik
+    tag, weak = response.get_etag()
+    if tag and not weak:
+        response.set_etag(tag, weak=True)
+    return response
+
+
+def init_compression(app):
+    app.config.setdefault("COMPRESS_ALGORITHMS", "zstd,br,gzip")
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESS_STREAM_SIZE", 256 * 1024)
+    app.config.setdefault("COMPRESS_CHUNK_SIZE", 64 * 1024)
+    app.config.setdefault("COMPRESS_GZIP_LEVEL", 6)
+    app.config.setdefault("COMPRESS_BR_LEVEL", 4)
+    app.config.setdefault("COMPRESS_ZSTD_LEVEL", 3)
+
+    app.extensions["compression"] = available_encodings(app.config["COMPRESS_ALGORITHMS"])
+    if app.extensions["compression"]:
+        app.after_request(compress_response)
@@ -0,0 +1,60 @@
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, make_response, request
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models.reference_version import ReferenceVersion
+
+
+def current_version(name):
+    # A verziókat folyamatonként gyorsítótárazzuk: a 304 válaszhoz nem kell adatbázis.
+    # Más worker írása legfeljebb REFERENCE_VERSION_TTL másodperc után látszik.
+    cache = current_app.extensions["reference_versions"]
+    with cache["lock"]:
+        if time.monotonic() - cache["loaded_at"] > current_app.config["REFERENCE_VERSION_TTL"]:
+            cache["versions"] = dict(db.session.execute(select(ReferenceVersion.name, ReferenceVersion.version)).all())
+            cache["loaded_at"] = time.monotonic()
+        return cache["versions"].get(name, 0)
+
+
+def bump_version(name):
+    # A hívó tranzakciójában nő; a saját gyorsítótár a commit után ürül
+    statement = sqlite_insert(ReferenceVersion).values(name=name, version=1)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[ReferenceVersion.name],
+        set_={"version": ReferenceVersion.version + 1}
+    ))
+    db.session.info["reference_versions_changed"] = True
+
+
+def invalidate_versions(session):
+    if session.info.pop("reference_versions_changed", False):
+        current_app.extensions["reference_versions"]["loaded_at"] = float("-inf")
+
+
+def etag(name):
+    # Feltételes GET: egyező If-None-Match esetén 304, a nézet (lekérdezés, marshmallow) nem fut le
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            tag = f"{name}-{current_version(name)}"
+            if request.if_none_match.contains_weak(tag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            response.set_etag(tag)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
+
+
+def init_conditional(app):
+    app.config.setdefault("REFERENCE_VERSION_TTL", 1.0)
+    app.extensions["reference_versions"] = {"lock": threading.Lock(), "versions": {}, "loaded_at": float("-inf")}
+    if not event.contains(db.session, "after_commit", invalidate_versions):
+        event.listen(db.session, "after_commit", invalidate_versions)
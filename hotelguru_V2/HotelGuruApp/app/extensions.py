@@ -1,6 +1,10 @@
+from functools import partial
+
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import make_url
 
 class Base(DeclarativeBase):
     pass
@@ -17,6 +21,86 @@ convention = {
 
 metadata = MetaData(naming_convention=convention)
 
-db = SQLAlchemy(model_class=Base, metadata=metadata)
 
+class RoutingSession(Session):
+    # Replikára irányított kérésben (info["replica"]) csak a SELECT megy a replikára;
+    # flush, INSERT/UPDATE/DELETE és minden más az elsődleges adatbázisra
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get("replica")
+        if replica is not None and bind is None and not self._flushing and getattr(clause, "is_select", False):
+            return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(model_class=Base, metadata=metadata, session_options={"class_": RoutingSession})
+
+
+def sqlite_in_memory(url):
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def engine_options(config):
+    # Kapcsolatkészlet a DB_POOL_* beállításokból; a memóriabeli SQLite egyetlen megosztott kapcsolatot
+    # használ (StaticPool), ott nincs méret és túlcsordulás
+    options = {
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+    }
+    if not sqlite_in_memory(config["SQLALCHEMY_DATABASE_URI"]):
+        options.update(
+            pool_size=config["DB_POOL_SIZE"],
+            max_overflow=config["DB_MAX_OVERFLOW"],
+            pool_timeout=config["DB_POOL_TIMEOUT"],
+        )
+    return options
+
+
+def replica_binds(config):
+    return {f"replica_{i}": uri for i, uri in enumerate(config["DB_REPLICA_URIS"])}
+
+
+def sqlite_pragmas(config, in_memory):
+    pragmas = {
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "cache_size": config["SQLITE_CACHE_SIZE"],
+    }
+    if not in_memory:
+        # A WAL mód a fájlban marad; olvasók nem várnak az íróra, az író csak a többi íróra
+        pragmas["journal_mode"] = config["SQLITE_JOURNAL_MODE"]
+        pragmas["mmap_size"] = config["SQLITE_MMAP_SIZE"]
+    return [(name, value) for name, value in pragmas.items() if value != ""]
+
+
+def apply_pragmas(pragmas, dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas:
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def init_db(app):
+    app.config.setdefault("DB_POOL_SIZE", 10)
+    app.config.setdefault("DB_MAX_OVERFLOW", 20)
+    app.config.setdefault("DB_POOL_TIMEOUT", 30)
+    app.config.setdefault("DB_POOL_RECYCLE", 3600)
+    app.config.setdefault("DB_POOL_PRE_PING", False)
+    app.config.setdefault("SQLITE_JOURNAL_MODE", "WAL")
+    app.config.setdefault("SQLITE_SYNCHRONOUS", "NORMAL")
+    app.config.setdefault("SQLITE_BUSY_TIMEOUT", 15000)
+    app.config.setdefault("SQLITE_CACHE_SIZE", -65536)
+    app.config.setdefault("SQLITE_MMAP_SIZE", 268435456)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    app.config.setdefault("DB_REPLICA_URIS", [])
+    app.config["SQLALCHEMY_BINDS"] = {**app.config.get("SQLALCHEMY_BINDS", {}), **replica_binds(app.config)}
+    db.init_app(app)
 
+    # Minden új SQLite kapcsolat megkapja a SQLITE_* pragmákat (a bindok motorjai is)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                pragmas = sqlite_pragmas(app.config, sqlite_in_memory(engine.url))
+                event.listen(engine, "connect", partial(apply_pragmas, pragmas))
@@ -0,0 +1,30 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+
+class ORJSONProvider(JSONProvider):
+    # A Flask alapértelmezésével egyező kulcssorrend: ugyanaz a válasz ugyanazokat a bájtokat adja
+    sort_keys = True
+    mimetype = "application/json"
+
+    def options(self):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.options()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Közvetlenül bájtokat ad a válasznak, a str kódolás/dekódolás kimarad
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.options() | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype
+        )
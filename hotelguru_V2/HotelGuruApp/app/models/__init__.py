@@ -7,6 +7,9 @@ import app.models.service
 import app.models.invoice
 import app.models.reservation
 import app.models.association_tables
+import app.models.daily_stats
+import app.models.invoice_checkpoint
+import app.models.reference_version
 
 
 
@@ -1,11 +1,14 @@
 from app.extensions import db
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Table, Index, Integer, Float
 
 invoice_service = db.Table(
     "invoice_service",
     db.metadata,
     Column("invoice_id", ForeignKey("invoices.id"), primary_key=True),
     Column("service_id", ForeignKey("services.id"), primary_key=True),
+    # Tételsor: mennyiség és a felszámításkori egységár, a szolgáltatás későbbi árváltozása nem hat rá
+    Column("quantity", Integer, nullable=False, default=1, server_default="1"),
+    Column("unit_price", Float, nullable=False),
 )
 
 reservation_room = db.Table(
@@ -13,4 +16,9 @@ reservation_room = db.Table(
     db.metadata,
     Column("reservation_id", ForeignKey("reservations.id"), primary_key=True),
     Column("room_id", ForeignKey("rooms.id"), primary_key=True),
+    # Foglaláskori éjszakai ár és szobatípus, a szoba későbbi módosítása nem hat rá
+    Column("price", Float, nullable=False),
+    Column("room_type_id", ForeignKey("room_types.id"), nullable=False),
+    # A PK (reservation_id, room_id) sorrendű, szoba szerinti kereséshez fordított index kell
+    Index("ix_reservation_room_room_id_reservation_id", "room_id", "reservation_id"),
 )
@@ -0,0 +1,82 @@
+﻿from app.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Integer, Float, Date
+from sqlalchemy import ForeignKey, select, delete, func, literal
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import date
+from app.models.reservation import Reservation, ACTIVE_STATUSES
+from app.models.association_tables import reservation_room
+
+
+class DailyStats(db.Model):
+    # Napi összesítő szobatípusonként: eladott szobaéjszakák és szobabevétel.
+    # A foglalások változásakor növekményesen frissül, a riport csak ezt olvassa.
+    __tablename__ = "daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    room_type_id: Mapped[int] = mapped_column(ForeignKey("room_types.id"), primary_key=True)
+    rooms_sold: Mapped[int] = mapped_column(Integer, default=0)
+    revenue: Mapped[float] = mapped_column(Float, default=0)
+
+    @classmethod
+    def contributions(cls, condition, first_day: date = None, last_day: date = None, sign: int = 1):
+        # A feltételnek megfelelő élő foglalások éjszakái napra és szobatípusra bontva.
+        # Rekurzív CTE: foglalásonként egy sor minden éjszakára, a [first_day, last_day) ablakra vágva.
+        first = func.max(Reservation.start_date, first_day) if first_day else Reservation.start_date
+        last = func.min(Reservation.end_date, last_day) if last_day else Reservation.end_date
+        nights = select(
+            Reservation.id.label("reservation_id"),
+            first.label("day"),
+            last.label("last_day")
+        ).where(
+            condition,
+            Reservation.status.in_(ACTIVE_STATUSES),
+            first < last
+        ).cte("nights", recursive=True)
+        next_day = func.date(nights.c.day, "+1 day")
+        nights = nights.union_all(
+            select(nights.c.reservation_id, next_day, nights.c.last_day).where(next_day < nights.c.last_day)
+        )
+        return select(
+            nights.c.day,
+            reservation_room.c.room_type_id,
+            (func.count() * sign).label("rooms_sold"),
+            (func.sum(reservation_room.c.price) * sign).label("revenue")
+        ).join(
+            reservation_room, reservation_room.c.reservation_id == nights.c.reservation_id
+        ).where(literal(True)).group_by(nights.c.day, reservation_room.c.room_type_id)
+
+    @classmethod
+    def apply(cls, condition, sign: int = 1, first_day: date = None, last_day: date = None):
+        # Hozzáadja (sign=1) vagy levonja (sign=-1) a foglalások hatását; a hívó tranzakciójában fut
+        statement = sqlite_insert(cls).from_select(
+            ["day", "room_type_id", "rooms_sold", "revenue"],
+            cls.contributions(condition, first_day, last_day, sign)
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[cls.day, cls.room_type_id],
+            set_={
+                "rooms_sold": cls.rooms_sold + statement.excluded.rooms_sold,
+                "revenue": cls.revenue + statement.excluded.revenue,
+            }
+        )
+        db.session.execute(statement)
+
+    @classmethod
+    def rebuild(cls, first_day: date = None, last_day: date = None):
+        # Teljes (vagy időszakra szűkített) újraépítés a foglalásokból
+        removed = delete(cls)
+        if first_day:
+            removed = removed.where(cls.day >= first_day)
+        if last_day:
+            removed = removed.where(cls.day < last_day)
+        db.session.execute(removed)
+        condition = literal(True)
+        if first_day:
+            condition = condition & (Reservation.end_date > first_day)
+        if last_day:
+            condition = condition & (Reservation.start_date < last_day)
+        cls.apply(condition, 1, first_day, last_day)
+
+    def __repr__(self) -> str:
+        return f"DailyStats(day={self.day!r}, room_type_id={self.room_type_id!r}, rooms_sold={self.rooms_sold!r}, revenue={self.revenue!r})"
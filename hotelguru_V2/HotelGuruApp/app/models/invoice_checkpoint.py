@@ -0,0 +1,18 @@
+﻿from app.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Integer, String, DateTime
+from datetime import datetime
+
+
+class InvoiceCloseCheckpoint(db.Model):
+    # Havi zárás: a már feldolgozott számla id tartományok, újraindításkor a pontosan egyezőket kihagyjuk
+    __tablename__ = "invoice_close_checkpoints"
+
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    first_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer)
+    closed: Mapped[int] = mapped_column(Integer, default=0)
+    finished_at: Mapped[datetime] = mapped_column(DateTime)
+
+    def __repr__(self) -> str:
+        return f"InvoiceCloseCheckpoint(month={self.month!r}, first_id={self.first_id!r}, last_id={self.last_id!r}, closed={self.closed!r})"
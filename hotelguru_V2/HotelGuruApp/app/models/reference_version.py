@@ -0,0 +1,14 @@
+﻿from app.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Integer, String
+
+
+class ReferenceVersion(db.Model):
+    # Törzsadat táblánkénti verziószámláló, minden írás növeli; ebből képződik az ETag
+    __tablename__ = "reference_versions"
+
+    name: Mapped[str] = mapped_column(String(30), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+    def __repr__(self) -> str:
+        return f"ReferenceVersion(name={self.name!r}, version={self.version!r})"
@@ -1,8 +1,8 @@
 ﻿import enum
 from app.extensions import db
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.types import Integer, Date
-from sqlalchemy import ForeignKey
+from sqlalchemy.types import Integer, Date, String
+from sqlalchemy import ForeignKey, Index, select
 from typing import List
 from datetime import date
 from sqlalchemy.exc import IntegrityError
@@ -12,10 +12,22 @@ class StatusEnum(enum.Enum):
     Canceled  = 0,
     Depending = 1,
     Success   = 2,
-    Expired   = 3
+    Expired   = 3,
+    Completed = 4
+
+# A szobát lefoglaló állapotok (a lezárt tartózkodás is foglaltnak számít)
+ACTIVE_STATUSES = ("Depending", "Success", "Completed")
 
 class Reservation(db.Model):
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Átfedés-kereséshez: end_date > start szűrés a régi foglalásokat kizárja
+        Index("ix_reservations_end_date_start_date", "end_date", "start_date"),
+        # Keyset lapozáshoz (start_date, id) sorrendben
+        Index("ix_reservations_start_date_id", "start_date", "id"),
+        # Felhasználó foglalásai állapot szerint
+        Index("ix_reservations_user_id_status", "user_id", "status"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     start_date: Mapped[date] = mapped_column(Date)
     end_date: Mapped[date] = mapped_column(Date)
@@ -27,11 +39,26 @@ class Reservation(db.Model):
     # room_id: Mapped[int] = mapped_column(ForeignKey("rooms.id"))
     # room: Mapped["Room"] = relationship(back_populates="reservations")
 
-    rooms: Mapped[List["Room"]] = relationship(secondary=reservation_room, backref="reservations")
+    # Csak olvasásra: a kapcsolósorokat (foglaláskori ár, szobatípus) a ReservationService.room_rows() adja
+    rooms: Mapped[List["Room"]] = relationship(secondary=reservation_room, backref="reservations", viewonly=True)
     
     invoice: Mapped["Invoice"] = relationship(back_populates="reservation")
 
-    status : Mapped[int] = mapped_column(default = "Depending")
+    status : Mapped[str] = mapped_column(String(9), default = "Depending")
+
+    @classmethod
+    def booked_room_ids(cls, start_date: date, end_date: date, exclude_id: int = None):
+        # Azon szobák id-ja, amelyek élő foglalása átfed a [start_date, end_date) intervallummal
+        query = select(reservation_room.c.room_id).join(
+            cls, cls.id == reservation_room.c.reservation_id
+        ).where(
+            cls.end_date > start_date,
+            cls.start_date < end_date,
+            cls.status.in_(ACTIVE_STATUSES)
+        )
+        if exclude_id is not None:
+            query = query.where(cls.id != exclude_id)
+        return query
 
     def __repr__(self) -> str:
         return f"Reservation(id={self.id!r}, start_date={self.start_date!r}, end_date={self.end_date!r}, reservation_date={self.reservation_date!r})"
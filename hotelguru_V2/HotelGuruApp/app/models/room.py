@@ -4,11 +4,22 @@ from app.extensions import db
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import Integer, String, Float
 from typing import List, Optional
+from datetime import date, timedelta
+from sqlalchemy import select, func, case, Index
+from sqlalchemy.orm import aliased
+from app.models.reservation import Reservation, ACTIVE_STATUSES
+from app.models.association_tables import reservation_room
 
+# Ennyi napon belül keresünk szomszédos foglalást a best-fit kiosztáshoz
+ALLOCATION_WINDOW_DAYS = 60
 
 
 class Room(db.Model):
     __tablename__ = "rooms"
+    __table_args__ = (
+        # Üzemelő szobák listázása és típus szerinti szabad szoba keresés
+        Index("ix_rooms_is_available_room_type_id", "is_available", "room_type_id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     number: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
     floor: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -16,13 +27,63 @@ class Room(db.Model):
     description: Mapped[Optional[str]] = mapped_column(String(200))
     price: Mapped[float] = mapped_column(Float)  # Ár, lebegőpontos számként
     is_available: Mapped[bool] = mapped_column(default=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # Foglaláskor nő, ütközésfigyeléshez
     
     room_type_id: Mapped[int] = mapped_column(Integer, db.ForeignKey("room_types.id"), nullable=False)
     room_type: Mapped["RoomType"] = relationship("RoomType", back_populates="rooms")
 
     #reservations: Mapped[List["Reservation"]] = relationship(secondary="reservation_room", back_populates="rooms")
     
-    
+    @classmethod
+    def available_between(cls, start_date: date, end_date: date, room_type_id: int = None):
+        # Üzemelő szobák, amelyeknek nincs átfedő foglalása a megadott időszakban
+        query = select(cls).where(
+            cls.is_available.is_(True),
+            cls.id.not_in(Reservation.booked_room_ids(start_date, end_date))
+        )
+        if room_type_id is not None:
+            query = query.where(cls.room_type_id == room_type_id)
+        return query.order_by(cls.number)
+
+    @classmethod
+    def allocate(cls, start_date: date, end_date: date, quantities: dict, exclude_numbers=()):
+        # Best-fit kiosztás: szobatípusonként azokat a szabad szobákat választjuk, ahol a
+        # foglalás a legszorosabban illeszkedik a szomszédos foglalások közé,
+        # így a hosszú szabad időszakok egyben maradnak
+        before = start_date - timedelta(days=ALLOCATION_WINDOW_DAYS)
+        after = end_date + timedelta(days=ALLOCATION_WINDOW_DAYS)
+        neighbours = select(
+            reservation_room.c.room_id,
+            func.max(case((Reservation.end_date <= start_date, Reservation.end_date))).label("prev_end"),
+            func.min(case((Reservation.start_date >= end_date, Reservation.start_date))).label("next_start")
+        ).join(
+            Reservation, Reservation.id == reservation_room.c.reservation_id
+        ).where(
+            Reservation.end_date > before,
+            Reservation.start_date < after,
+            Reservation.status.in_(ACTIVE_STATUSES)
+        ).group_by(reservation_room.c.room_id).subquery()
+
+        # SQLite: julianday() a napok különbségéhez
+        gap = func.julianday(func.coalesce(neighbours.c.next_start, after)) \
+            - func.julianday(func.coalesce(neighbours.c.prev_end, before))
+        ranked = select(
+            cls,
+            func.row_number().over(partition_by=cls.room_type_id, order_by=(gap, cls.number)).label("rank")
+        ).outerjoin(
+            neighbours, neighbours.c.room_id == cls.id
+        ).where(
+            cls.is_available.is_(True),
+            cls.room_type_id.in_(quantities),
+            cls.number.not_in(exclude_numbers),
+            cls.id.not_in(Reservation.booked_room_ids(start_date, end_date))
+        ).subquery()
+
+        room = aliased(cls, ranked)
+        return select(room).where(
+            ranked.c.rank <= case(quantities, value=ranked.c.room_type_id)
+        ).order_by(ranked.c.room_type_id, ranked.c.rank)
+
 
     def __repr__(self) -> str:
         return f"Room(id={self.id!r}, number={self.number!s}, type={self.room_type!s}, available={self.is_available!r})"
@@ -17,7 +17,7 @@ class Service(db.Model):
     deleted : Mapped[int] = mapped_column(default = 0)
     
 
-    invoices: Mapped[List["Invoice"]] = relationship(secondary=invoice_service, back_populates="services")
+    invoices: Mapped[List["Invoice"]] = relationship(secondary=invoice_service, back_populates="services", viewonly=True)
 
     def __repr__(self) -> str:
         return f"Service(id={self.id!r}, name={self.name!s}, description={self.description!s} , price={self.price!r})"
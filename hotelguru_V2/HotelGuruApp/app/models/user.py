@@ -3,10 +3,10 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import String, Integer
 from sqlalchemy import ForeignKey, Column, Table
 from typing import List, Optional
-from app.models.role import Role  # Import the Role class
+#from app.models.role import Role  # Import the Role class
 from app.models.address import Address  # Import the Address class
 from app.models.reservation import Reservation  # Import the Reservation class
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.passwords import hash_password, verify_password, needs_rehash
 
 
 
@@ -22,7 +22,7 @@ class User(db.Model):
     __tablename__ = "users"
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(30))
-    email: Mapped[Optional[str]]
+    email: Mapped[Optional[str]] = mapped_column(index=True, unique=True)
     password: Mapped[str] = mapped_column(String(30))
     phone : Mapped[str] = mapped_column(String(30))
     
@@ -37,8 +37,11 @@ class User(db.Model):
         return f"User(id={self.id!r}, name={self.name!s}, email={self.email!r})"
     
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return verify_password(self.password, password)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password)
 
@@ -0,0 +1,69 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+def submit(function, *args):
+    # A hashlib scrypt/pbkdf2 hívásai elengedik a GIL-t, így a szálkészlet valóban párhuzamos.
+    # Telített sor esetén nem várakozunk: a hívó azonnal 503-at ad, a foglalási végpontok szabadok maradnak.
+    executor, slots = current_app.extensions["password_pool"]
+    if not slots.acquire(blocking=False):
+        raise PasswordPoolBusy("Too many concurrent logins, please try again")
+    try:
+        future = executor.submit(function, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def hash_password(password):
+    return submit(
+        generate_password_hash,
+        password,
+        current_app.config["PASSWORD_HASH_METHOD"],
+        current_app.config["PASSWORD_HASH_SALT_LENGTH"]
+    )
+
+
+def verify_password(pwhash, password):
+    return submit(check_password_hash, pwhash, password)
+
+
+def current_method():
+    # A werkzeug a teljes paraméterezést tárolja ("pbkdf2:sha256" -> "pbkdf2:sha256:1000000"), ezért a
+    # beállított módszer helyett egy minta hash előtagjával hasonlítunk; az első híváskor számoljuk ki
+    state = current_app.extensions["password_hash"]
+    if state["method"] is None:
+        state["method"] = generate_password_hash(
+            "", current_app.config["PASSWORD_HASH_METHOD"], current_app.config["PASSWORD_HASH_SALT_LENGTH"]
+        ).partition("$")[0]
+    return state["method"]
+
+
+def needs_rehash(pwhash):
+    # A tárolt hash formátuma: "módszer:paraméterek$só$hash"
+    method, _, rest = pwhash.partition("$")
+    salt = rest.partition("$")[0]
+    return method != current_method() \
+        or len(salt) != current_app.config["PASSWORD_HASH_SALT_LENGTH"]
+
+
+def init_passwords(app):
+    app.config.setdefault("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    app.config.setdefault("PASSWORD_HASH_SALT_LENGTH", 16)
+    app.config.setdefault("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)
+    app.config.setdefault("PASSWORD_HASH_QUEUE", 2 * app.config["PASSWORD_HASH_WORKERS"])
+    workers = app.config["PASSWORD_HASH_WORKERS"]
+    # Egyszerre legfeljebb ennyi hash futhat vagy várhat (futó + sorban álló)
+    slots = threading.BoundedSemaphore(workers + app.config["PASSWORD_HASH_QUEUE"])
+    app.extensions["password_hash"] = {"method": None}
+    app.extensions["password_pool"] = (ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash"), slots)
@@ -0,0 +1,29 @@
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.record_queries import get_recorded_queries
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+
+from app.extensions import db
+
+
+def raise_on_lazy_load(orm_execute_state):
+    # Szigorú mód: GET kérés alatt minden, a lekérdezésben előre be nem töltött kapcsolat
+    # elérése hibát dob, így az N+1 lekérdezések azonnal kiderülnek
+    if (orm_execute_state.is_select
+            and has_request_context()
+            and request.method == "GET"
+            and current_app.config["SQLALCHEMY_STRICT_LOADING"]):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+def init_query_policy(app):
+    app.config.setdefault("SQLALCHEMY_STRICT_LOADING", False)
+    if not event.contains(db.session, "do_orm_execute", raise_on_lazy_load):
+        event.listen(db.session, "do_orm_execute", raise_on_lazy_load)
+
+    if app.config.get("SQLALCHEMY_RECORD_QUERIES"):
+        @app.after_request
+        def add_query_count(response):
+            # Kérésenkénti lekérdezésszám, tesztekből ellenőrizhető
+            response.headers["X-Query-Count"] = str(len(get_recorded_queries()))
+            return response
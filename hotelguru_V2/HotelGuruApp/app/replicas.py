@@ -0,0 +1,100 @@
+import random
+import sqlite3
+import time
+from functools import wraps
+
+import click
+from flask import current_app, has_request_context, session
+from flask.cli import with_appcontext
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app.extensions import db, replica_binds
+
+
+def replica(view):
+    # Csak olvasó végpont: a lekérdezései egy replikára mennek, kivéve ha a kliens nemrég írt
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        replicas = current_app.extensions["db_replicas"]
+        if not replicas or session.get("primary_until", 0) > time.time():
+            return view(*args, **kwargs)
+        db.session.info["replica"] = random.choice(replicas)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            db.session.info.pop("replica", None)
+    return wrapper
+
+
+def mark_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["replica_wrote"] = True
+
+
+def mark_flush(db_session, flush_context):
+    db_session.info["replica_wrote"] = True
+
+
+def stick_to_primary(db_session):
+    # Read-your-writes: az író kliens DB_REPLICA_STICKY másodpercig az elsődlegesről olvas,
+    # amíg a replika utoléri (a jel a Flask session sütijében utazik)
+    if db_session.info.pop("replica_wrote", False) and has_request_context() and current_app.extensions["db_replicas"]:
+        session["primary_until"] = time.time() + current_app.config["DB_REPLICA_STICKY"]
+
+
+def discard_write(db_session):
+    db_session.info.pop("replica_wrote", None)
+
+
+def sqlite_path(uri):
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite" or not url.database:
+        raise click.ClickException(f"Only SQLite file databases can be copied: {url!r}")
+    return url.database
+
+
+def copy_database(source, target):
+    # Online backup: a forrás közben írható, a cél olvasói a régi vagy az új teljes állapotot látják
+    src, dst = sqlite3.connect(source, timeout=30), sqlite3.connect(target, timeout=30)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+@click.command("replica-sync")
+@click.option("--interval", type=float, help="Seconds between copies, overrides DB_REPLICA_SYNC_INTERVAL.")
+@click.option("--once", is_flag=True, help="Copy once and exit.")
+@with_appcontext
+def replica_sync_command(interval, once):
+    """Keep SQLite replica files in sync with the primary database (local testing)."""
+    config = current_app.config
+    source = sqlite_path(config["SQLALCHEMY_DATABASE_URI"])
+    targets = [sqlite_path(uri) for uri in config["DB_REPLICA_URIS"]]
+    if not targets:
+        raise click.ClickException("No replicas configured, set DB_REPLICA_URIS.")
+    interval = interval if interval is not None else config["DB_REPLICA_SYNC_INTERVAL"]
+    while True:
+        started = time.perf_counter()
+        for target in targets:
+            copy_database(source, target)
+        click.echo(f"copied to {len(targets)} replica(s) in {time.perf_counter() - started:.3f}s")
+        if once:
+            return
+        time.sleep(interval)
+
+
+def init_replicas(app):
+    app.config.setdefault("DB_REPLICA_URIS", [])
+    app.config.setdefault("DB_REPLICA_STICKY", 5.0)
+    app.config.setdefault("DB_REPLICA_SYNC_INTERVAL", 1.0)
+    app.extensions["db_replicas"] = list(replica_binds(app.config))
+    app.cli.add_command(replica_sync_command)
+
+    if not event.contains(db.session, "do_orm_execute", mark_write):
+        event.listen(db.session, "do_orm_execute", mark_write)
+        event.listen(db.session, "after_flush", mark_flush)
+        event.listen(db.session, "after_commit", stick_to_primary)
+        event.listen(db.session, "after_rollback", discard_write)
@@ -0,0 +1,94 @@
+import os
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.extensions import db
+from app.cache import SQLiteCache
+from app.auth import insecure_key
+
+
+def warm_up(app):
+    # A master egyszer építi fel az OpenAPI leírást, a workerek készen kapják a forkkal
+    with app.app_context():
+        app.spec
+
+
+def after_fork(app):
+    # A masterben megnyitott adatbázis kapcsolatok nem oszthatók meg: a worker újakat nyit
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    backend = app.extensions["response_cache"]["backend"]
+    if isinstance(backend, SQLiteCache):
+        backend.reset_connections()
+
+
+def server_options(config):
+    return {
+        "bind": config["SERVER_BIND"],
+        "workers": config["SERVER_WORKERS"],
+        "threads": config["SERVER_THREADS"],
+        "worker_class": "gthread" if config["SERVER_THREADS"] > 1 else "sync",
+        "preload_app": config["SERVER_PRELOAD"],
+        "max_requests": config["SERVER_MAX_REQUESTS"],
+        "max_requests_jitter": config["SERVER_MAX_REQUESTS_JITTER"],
+        "timeout": config["SERVER_TIMEOUT"],
+        "graceful_timeout": config["SERVER_GRACEFUL_TIMEOUT"],
+        "keepalive": config["SERVER_KEEPALIVE"],
+        "pidfile": config["SERVER_PIDFILE"] or None,
+        "accesslog": config["SERVER_ACCESS_LOG"] or None,
+    }
+
+
+@click.command("serve")
+@click.option("--bind", help="Address to listen on, overrides SERVER_BIND.")
+@click.option("--workers", type=int, help="Worker processes, overrides SERVER_WORKERS.")
+@click.option("--threads", type=int, help="Threads per worker, overrides SERVER_THREADS.")
+@with_appcontext
+def serve_command(bind, workers, threads):
+    """Run the API with a multi-process production server.
+
+    HUP restarts the workers gracefully; with SERVER_PRELOAD new code is
+    picked up by USR2 (start a new master), then TERM to the old master.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise click.ClickException("The serve command needs gunicorn (not available on Windows, use run_app.py there).")
+
+    config = current_app.config
+    if insecure_key(current_app):
+        raise click.ClickException("SECRET_KEY is not set (or is the default), set the SECRET_KEY environment variable.")
+    options = server_options(config)
+    options.update({key: value for key, value in
+                    {"bind": bind, "workers": workers, "threads": threads}.items() if value is not None})
+    if options["threads"] > 1:
+        options["worker_class"] = "gthread"
+    if options["workers"] > 1 and config["RESPONSE_CACHE_BACKEND"] == "memory":
+        # Workerenkénti LRU: egy írás csak a saját worker példányát ürítené, a többi régi választ adna
+        raise click.ClickException("RESPONSE_CACHE_BACKEND=memory is per process, use sqlite (or none) "
+                                   "with more than one worker.")
+
+    if options["preload_app"]:
+        # Előtöltés: a már felépített alkalmazás kerül a workerekbe, csak a kapcsolatok nyílnak újra
+        app = current_app._get_current_object()
+        warm_up(app)
+        options["post_fork"] = lambda server, worker: after_fork(app)
+        load = lambda: app
+    else:
+        from app import create_app
+        load = create_app
+
+    class Server(BaseApplication):
+
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load()
+
+    click.echo(f"Serving on {options['bind']} with {options['workers']} workers x {options['threads']} threads (pid {os.getpid()})")
+    Server().run()
@@ -0,0 +1,141 @@
+"""Párhuzamos írási áteresztőképesség több worker folyamattal.
+
+Minden mód saját SQLite fájlt kap. A writer folyamatok egymást nem átfedő
+foglalásokat küldenek a /api/reservation/add végpontra, a reader folyamatok
+közben a foglalási listát olvassák. Így minden 409 a zárolásból ered
+("database is locked"), nem valódi ütközésből. "default": az SQLite
+alapértelmezései (rollback napló, synchronous=FULL), "tuned": a Config
+SQLITE_* pragmái (WAL, synchronous=NORMAL, busy_timeout, cache, mmap).
+Futtatás a HotelGuruApp mappából:
+
+    python benchmarks/concurrency.py --writers 4 --readers 2 --bookings 300
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app
+from app.extensions import db
+
+ROOMS_PER_WRITER = 20
+
+MODES = {
+    "default": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT": "5000",
+                "SQLITE_CACHE_SIZE": "", "SQLITE_MMAP_SIZE": ""},
+    "tuned": {},
+}
+
+
+def make_config(path, overrides):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + path
+        TESTING = True
+        RESPONSE_CACHE_BACKEND = "none"
+
+    for key, value in overrides.items():
+        setattr(BenchmarkConfig, key, value)
+    return BenchmarkConfig
+
+
+def seed(app, writers):
+    from app.models.address import Address
+    from app.models.role import Role
+    from app.models.room import Room
+    from app.models.room_type import RoomType
+    from app.models.user import User
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Role(name="Guest"), RoomType(name="Egy ágyas")])
+        db.session.flush()
+        db.session.add_all([Room(number=100 + i, floor=1, name=f"Szoba {100 + i}", price=10000, room_type_id=1)
+                            for i in range(writers * ROOMS_PER_WRITER)])
+        db.session.add(User(name="Teszt", email="teszt@hotelguru.hu", password="x", phone="0",
+                            address=Address(city="Veszprém", street="Egyetem u. 1", postalcode=8200)))
+        db.session.commit()
+
+
+def writer(index, path, overrides, bookings, barrier, results):
+    client = create_app(config_class=make_config(path, overrides)).test_client()
+    statuses = Counter()
+    first_day = date(2025, 6, 1)
+    barrier.wait()
+    for i in range(bookings):
+        # Saját szobák, soronként új időszak: a foglalások sosem fedik egymást
+        start = first_day + timedelta(days=3 * (i // ROOMS_PER_WRITER))
+        response = client.post("/api/reservation/add", json={
+            "user": 1,
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=2)).isoformat(),
+            "reservation_date": first_day.isoformat(),
+            "room_numbers": [100 + index * ROOMS_PER_WRITER + i % ROOMS_PER_WRITER],
+        })
+        statuses[response.status_code] += 1
+    results.put(("write", statuses))
+
+
+def reader(path, overrides, stop, barrier, results):
+    client = create_app(config_class=make_config(path, overrides)).test_client()
+    statuses = Counter()
+    barrier.wait()
+    while not stop.is_set():
+        statuses[client.get("/api/reservation/list/?limit=50").status_code] += 1
+    results.put(("read", statuses))
+
+
+def run(mode, args):
+    context = multiprocessing.get_context("spawn")
+    path = os.path.join(tempfile.mkdtemp(), f"concurrency_{mode}.db")
+    overrides = MODES[mode]
+    seed(create_app(config_class=make_config(path, overrides)), args.writers)
+
+    barrier = context.Barrier(args.writers + args.readers + 1)
+    stop, results = context.Event(), context.Queue()
+    writers = [context.Process(target=writer, args=(i, path, overrides, args.bookings, barrier, results))
+               for i in range(args.writers)]
+    readers = [context.Process(target=reader, args=(path, overrides, stop, barrier, results))
+               for _ in range(args.readers)]
+    for process in writers + readers:
+        process.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for process in writers:
+        process.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+
+    totals = {"write": Counter(), "read": Counter()}
+    for _ in writers + readers:
+        kind, statuses = results.get()
+        totals[kind].update(statuses)
+    for process in readers:
+        process.join()
+
+    written = totals["write"][200]
+    print(f"{mode:<8} {elapsed:8.2f}s {written / elapsed:9.1f} writes/s {totals['read'][200] / elapsed:9.1f} reads/s "
+          f"write statuses={dict(sorted(totals['write'].items()))} read statuses={dict(sorted(totals['read'].items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--bookings", type=int, default=300, help="bookings per writer")
+    parser.add_argument("--mode", choices=[*MODES, "both"], default="both")
+    args = parser.parse_args()
+
+    print(f"{args.writers} writer and {args.readers} reader processes, {args.bookings} bookings per writer")
+    for mode in MODES if args.mode == "both" else [args.mode]:
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
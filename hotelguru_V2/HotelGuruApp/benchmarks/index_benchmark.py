@@ -0,0 +1,139 @@
+"""Indexek hatása a gyakori lekérdezésekre.
+
+Nagy szintetikus adatbázist épít egy ideiglenes SQLite fájlban, majd a
+c41f6a9e2d58 migráció indexei nélkül és azokkal is kiírja a lekérdezések
+EXPLAIN QUERY PLAN kimenetét és futásidejét. Futtatás a HotelGuruApp mappából:
+
+    python benchmarks/index_benchmark.py --reservations 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_, select, text
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.models.address import Address
+from app.models.association_tables import reservation_room
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.user import User
+
+# A c41f6a9e2d58 migrációban felvett indexek
+INDEXES = [
+    "ix_reservations_user_id_status",
+    "ix_reservation_room_room_id_reservation_id",
+    "ix_rooms_is_available_room_type_id",
+    "ix_users_email",
+]
+
+
+def build(rooms, users, reservations):
+    rnd = random.Random(42)
+    db.session.execute(insert(RoomType), [{"name": f"Típus {i}"} for i in range(4)])
+    db.session.execute(insert(Room), [
+        {"number": 100 + i, "floor": 1 + i // 50, "price": 10000, "room_type_id": 1 + i % 4, "is_available": i % 20 != 0}
+        for i in range(rooms)
+    ])
+    db.session.execute(insert(Address), [{"city": "Veszprém", "street": "Egyetem u. 1", "postalcode": 8200}])
+    db.session.execute(insert(User), [
+        {"name": f"Vendég {i}", "email": f"guest{i}@hotelguru.hu", "password": "x", "phone": "0", "address_id": 1}
+        for i in range(users)
+    ])
+    first_day = date(2015, 1, 1)
+    for offset in range(0, reservations, 50000):
+        batch = range(offset, min(offset + 50000, reservations))
+        starts = {i: first_day + timedelta(days=rnd.randrange(3650)) for i in batch}
+        db.session.execute(insert(Reservation), [{
+            "id": i + 1,
+            "user_id": 1 + rnd.randrange(users),
+            "start_date": starts[i],
+            "end_date": starts[i] + timedelta(days=rnd.randint(1, 7)),
+            "reservation_date": starts[i] - timedelta(days=30),
+            "status": rnd.choice(["Success", "Completed", "Completed", "Expired", "Canceled", "Depending"]),
+        } for i in batch])
+        room_ids = {i: rnd.randrange(rooms) for i in batch}
+        db.session.execute(insert(reservation_room), [
+            {"reservation_id": i + 1, "room_id": 1 + room_ids[i], "price": 10000, "room_type_id": 1 + room_ids[i] % 4}
+            for i in batch
+        ])
+    db.session.commit()
+
+
+def queries():
+    return {
+        "reservations by user": select(Reservation).where(
+            Reservation.user_id == 17,
+            or_(Reservation.status == "Depending", Reservation.status == "Success")
+        ).order_by(Reservation.start_date, Reservation.id).limit(50),
+        "reservations by room": select(Reservation).where(Reservation.id.in_(
+            select(reservation_room.c.reservation_id).join(
+                Room, Room.id == reservation_room.c.room_id
+            ).where(Room.number == 142)
+        )).order_by(Reservation.start_date, Reservation.id).limit(50),
+        "available rooms list": select(Room).where(Room.is_available.is_(True), Room.room_type_id == 2),
+        "login by e-mail": select(User).where(User.email == "guest1234@hotelguru.hu"),
+        "free rooms for a week": Room.available_between(date(2024, 6, 1), date(2024, 6, 8)),
+        "best-fit allocation": Room.allocate(date(2024, 6, 1), date(2024, 6, 8), {2: 3}),
+    }
+
+
+def measure(label, repeat):
+    print(f"\n=== {label}")
+    for name, query in queries().items():
+        compiled = query.compile(db.engine, compile_kwargs={"literal_binds": True})
+        plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            db.session.execute(query).all()
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:<24} {best * 1000:9.2f} ms")
+        for row in plan:
+            print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--reservations", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "index_benchmark.db")
+        RESPONSE_CACHE_BACKEND = "memory"
+        TESTING = True
+
+    app = create_app(config_class=BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        indexes = [index for table in db.metadata.tables.values() for index in table.indexes if index.name in INDEXES]
+        for index in indexes:
+            index.drop(db.engine)
+
+        started = time.perf_counter()
+        build(args.rooms, args.users, args.reservations)
+        print(f"{args.reservations} reservations, {args.users} users, {args.rooms} rooms "
+              f"built in {time.perf_counter() - started:.1f}s")
+        db.session.execute(text("ANALYZE"))
+
+        measure("before", args.repeat)
+        for index in indexes:
+            index.create(db.engine)
+        db.session.execute(text("ANALYZE"))
+        measure("after", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
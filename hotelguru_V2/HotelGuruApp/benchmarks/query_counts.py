@@ -0,0 +1,103 @@
+"""N+1 ellenőrzés a lista végpontokra.
+
+Szigorú betöltési móddal (SQLALCHEMY_STRICT_LOADING) és lekérdezésszámlálással
+hívja a GET végpontokat, és hibával lép ki, ha valamelyik végpont lusta
+betöltést próbál, vagy több lekérdezést futtat a megengedettnél. CI-ban:
+
+    python benchmarks/query_counts.py
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.auth import issue_token
+
+# végpont -> megengedett lekérdezések száma, a sorok számától függetlenül
+BUDGETS = {
+    "/api/room/list/": 1,
+    "/api/room/show/101": 1,
+    "/api/room/available?start=2025-06-01&end=2025-06-03": 1,
+    "/api/reservation/list/?limit=200": 2,
+    "/api/reservation/list_by_room/101": 2,
+    "/api/reservation/list_by_user/1": 2,
+    "/api/reservation/search_by_id/1": 2,
+    "/api/reservation/calendar?start=2025-06-01&days=30": 2,
+    "/api/reservation/stats?start=2025-06-01&end=2025-07-01": 2,
+    # ETag-es végpontok: hideg gyorsítótárnál +1 lekérdezés a verziószámokért
+    "/api/service/list": 2,
+    "/api/user/roles": 2,
+    "/api/room/types": 2,
+    "/api/user/roles/1": 2,
+}
+
+
+class CheckConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    RESPONSE_CACHE_BACKEND = "memory"
+    TESTING = True
+    SQLALCHEMY_STRICT_LOADING = True
+    SQLALCHEMY_RECORD_QUERIES = True
+
+
+def seed(rooms=50, reservations=200):
+    from app.blueprints.reservation.service import ReservationService
+    from app.models.address import Address
+    from app.models.association_tables import reservation_room
+    from app.models.reservation import Reservation
+    from app.models.role import Role
+    from app.models.room import Room
+    from app.models.room_type import RoomType
+    from app.models.service import Service
+    from app.models.user import User
+
+    db.create_all()
+    guest = Role(name="Guest")
+    admin = Role(name="Administrator")
+    db.session.add_all([guest, admin, RoomType(name="Egy ágyas"), RoomType(name="Két ágyas")])
+    db.session.add_all([Service(name=f"Szolgáltatás {i}", description="", price=1000) for i in range(10)])
+    user = User(name="Teszt", email="teszt@hotelguru.hu", password="x", phone="0",
+                address=Address(city="Veszprém", street="Egyetem u. 1", postalcode=8200), roles=[guest, admin])
+    db.session.add(user)
+    room_list = [Room(number=101 + i, floor=1 + i // 10, price=10000, room_type_id=1 + i % 2) for i in range(rooms)]
+    db.session.add_all(room_list)
+    reservation_list = []
+    for i in range(reservations):
+        start = date(2025, 6, 1) + timedelta(days=i % 30)
+        reservation_list.append(Reservation(user=user, start_date=start, end_date=start + timedelta(days=2),
+                                            reservation_date=date(2025, 5, 1), status="Success"))
+    db.session.add_all(reservation_list)
+    db.session.flush()
+    db.session.execute(insert(reservation_room), [
+        row for i, reservation in enumerate(reservation_list)
+        for row in ReservationService.room_rows(reservation.id, [room_list[i % rooms], room_list[(i + 1) % rooms]])
+    ])
+    db.session.commit()
+    return issue_token(user)
+
+
+def main():
+    app = create_app(config_class=CheckConfig)
+    failed = False
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {seed()}"}
+
+    # Minden kérés saját app contextet kap, így a számláló kérésenként indul
+    client = app.test_client()
+    for url, budget in BUDGETS.items():
+        response = client.get(url, headers=headers)
+        count = int(response.headers.get("X-Query-Count", -1))
+        ok = response.status_code == 200 and count <= budget
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {response.status_code} queries={count:<3} budget={budget:<3} {url}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
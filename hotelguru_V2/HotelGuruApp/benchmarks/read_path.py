@@ -0,0 +1,140 @@
+"""ORM nélküli olvasási út mérése a lista végpontokon.
+
+Nagy szintetikus adatbázison összeveti a korábbi, ORM objektumokat betöltő
+megvalósítást a csak oszlopokat lekérdező szolgáltatásokkal: legjobb futásidő
+és tracemalloc csúcs memória. Futtatás a HotelGuruApp mappából:
+
+    python benchmarks/read_path.py --rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.blueprints.reservation.schemas import ReservationPageSchema
+from app.blueprints.reservation.service import ReservationService
+from app.blueprints.room.schemas import AllRoomListSchema
+from app.blueprints.room.service import RoomService
+from app.blueprints.service.schemas import ServiceListSchema
+from app.blueprints.service.service import ServiceService
+from app.models.address import Address
+from app.models.association_tables import reservation_room
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.models.room_type import RoomType
+from app.models.service import Service
+from app.models.user import User
+
+
+def build(rows):
+    db.session.execute(insert(RoomType), [{"name": f"Típus {i}"} for i in range(4)])
+    db.session.execute(insert(Room), [
+        {"number": 100 + i, "floor": 1 + i // 50, "name": f"Szoba {i}", "price": 10000, "room_type_id": 1 + i % 4}
+        for i in range(rows)
+    ])
+    db.session.execute(insert(Service), [
+        {"name": f"Szolgáltatás {i}", "description": "Leírás", "price": 1000} for i in range(rows)
+    ])
+    db.session.execute(insert(Address), [{"city": "Veszprém", "street": "Egyetem u. 1", "postalcode": 8200}])
+    db.session.execute(insert(User), [{"name": "Vendég", "email": "guest@hotelguru.hu", "password": "x", "phone": "0", "address_id": 1}])
+    db.session.execute(insert(Reservation), [{
+        "id": i + 1, "user_id": 1, "start_date": date(2025, 1, 1) + timedelta(days=i % 365),
+        "end_date": date(2025, 1, 3) + timedelta(days=i % 365), "reservation_date": date(2024, 12, 1), "status": "Success",
+    } for i in range(rows)])
+    db.session.execute(insert(reservation_room), [
+        {"reservation_id": i + 1, "room_id": 1 + (i + k) % rows, "price": 10000, "room_type_id": 1 + (i + k) % rows % 4}
+        for i in range(rows) for k in range(2)
+    ])
+    db.session.commit()
+
+
+# A végpontok @bp.output sémái: mindkét megvalósítás kimenete ugyanezzel szerializálódik
+room_list_schema = AllRoomListSchema(many=True)
+service_list_schema = ServiceListSchema(many=True)
+reservation_page_schema = ReservationPageSchema()
+
+
+# A korábbi, ORM objektumokat betöltő megvalósítások
+def orm_rooms():
+    rooms = db.session.execute(
+        select(Room).filter(Room.is_available.is_(True)).options(joinedload(Room.room_type))
+    ).scalars()
+    return room_list_schema.dump(rooms)
+
+
+def orm_services():
+    return service_list_schema.dump(db.session.execute(select(Service)).scalars())
+
+
+def orm_reservations(limit):
+    reservations = db.session.execute(
+        select(Reservation).order_by(Reservation.start_date, Reservation.id).limit(limit + 1)
+        .options(selectinload(Reservation.rooms))
+    ).scalars().all()
+    return reservation_page_schema.dump({"items": reservations[:limit], "next_cursor": None})
+
+
+def measure(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    db.session.expunge_all()
+    tracemalloc.start()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "read_path.db")
+        TESTING = True
+        RESPONSE_CACHE_BACKEND = "none"
+
+    app = create_app(config_class=BenchmarkConfig)
+    page = {"limit": 200}
+    cases = [
+        ("room list", orm_rooms, lambda: room_list_schema.dump(RoomService.room_list_all()[1])),
+        ("service list", orm_services, lambda: service_list_schema.dump(ServiceService.service_list_all()[1])),
+        ("reservation page", lambda: orm_reservations(page["limit"]),
+         lambda: reservation_page_schema.dump(ReservationService.reservation_list_all(dict(page))[1])),
+    ]
+    with app.app_context():
+        db.create_all()
+        build(args.rows)
+        print(f"{args.rows} rows, best of {args.repeat}")
+        print(f"{'endpoint':<18} {'orm ms':>9} {'core ms':>9} {'orm MiB':>9} {'core MiB':>9}")
+        for name, orm, core in cases:
+            orm_time, orm_peak, orm_result = measure(orm, args.repeat)
+            core_time, core_peak, core_result = measure(core, args.repeat)
+            if name == "reservation page":
+                orm_result, core_result = orm_result["items"], core_result["items"]
+                for item in orm_result + core_result:
+                    item["rooms"] = sorted(room["number"] for room in item["rooms"])
+            assert orm_result == core_result, f"{name}: different output"
+            print(f"{name:<18} {orm_time * 1000:9.1f} {core_time * 1000:9.1f} "
+                  f"{orm_peak / 2 ** 20:9.1f} {core_peak / 2 ** 20:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
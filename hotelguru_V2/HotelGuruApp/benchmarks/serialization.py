@@ -0,0 +1,121 @@
+"""Lista végpontok szerializálásának mérése.
+
+"before": a korábbi út, ahol a szolgáltatás minden hívásnál új sémapéldánnyal
+szerializált, a @bp.output még egyszer, majd a Flask alapértelmezett (json
+modul alapú) providere írta ki. "after": egyetlen szerializálás a @bp.output
+egyszer létrehozott sémájával és orjson. Utána a teljes HTTP kérés ideje a
+két JSON providerrel. Futtatás a HotelGuruApp mappából:
+
+    python benchmarks/serialization.py --rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.json_provider import ORJSONProvider
+from app.blueprints.reservation.schemas import ReservationPageSchema
+from app.blueprints.reservation.service import ReservationService
+from app.blueprints.room.schemas import AllRoomListSchema
+from app.blueprints.room.service import RoomService
+from app.blueprints.service.schemas import ServiceListSchema
+from app.blueprints.service.service import ServiceService
+
+from read_path import build
+
+# végpont -> (URL, a @bp.output sémája, szolgáltatás)
+CASES = {
+    "room list": ("/api/room/list/", lambda: AllRoomListSchema(many=True), RoomService.room_list_all),
+    "room available": (
+        "/api/room/available?start=2025-06-01&end=2025-06-03",
+        lambda: AllRoomListSchema(many=True),
+        lambda: RoomService.room_available({"start": date(2025, 6, 1), "end": date(2025, 6, 3)}),
+    ),
+    "service list": ("/api/service/list", lambda: ServiceListSchema(many=True), ServiceService.service_list_all),
+    "reservation page": (
+        "/api/reservation/list/?limit=200",
+        ReservationPageSchema,
+        lambda: ReservationService.reservation_list_all({"limit": 200}),
+    ),
+}
+
+
+def best_of(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def measure_serialization(app, repeat):
+    stdlib_json, fast_json = DefaultJSONProvider(app), ORJSONProvider(app)
+    print(f"{'serialization':<18} {'before ms':>10} {'after ms':>10} {'before B':>10} {'after B':>10}")
+    for name, (_, schema, service) in CASES.items():
+        output_schema = schema()
+
+        def before():
+            # Szolgáltatásbeli dump friss sémával, majd a @bp.output dumpja és a json modul
+            data = schema().dump(service()[1])
+            return stdlib_json.dumps(output_schema.dump(data))
+
+        def after():
+            return fast_json.dumps(output_schema.dump(service()[1]))
+
+        before_time, before_body = best_of(before, repeat)
+        after_time, after_body = best_of(after, repeat)
+        assert stdlib_json.loads(before_body) == fast_json.loads(after_body), f"{name}: different output"
+        print(f"{name:<18} {before_time * 1000:10.1f} {after_time * 1000:10.1f} "
+              f"{len(before_body.encode()):10} {len(after_body.encode()):10}")
+
+
+def measure_requests(app, repeat):
+    client = app.test_client()
+    print(f"\n{'request':<18} {'json ms':>10} {'orjson ms':>10}")
+    for name, (url, _, _) in CASES.items():
+        timings = []
+        for provider in (DefaultJSONProvider, ORJSONProvider):
+            app.json = provider(app)
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = client.get(url)
+                best = min(best, time.perf_counter() - started)
+            assert response.status_code == 200, f"{name}: {response.status_code}"
+            timings.append(best)
+        print(f"{name:<18} {timings[0] * 1000:10.1f} {timings[1] * 1000:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "serialization.db")
+        TESTING = True
+        RESPONSE_CACHE_BACKEND = "none"
+
+    app = create_app(config_class=BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        build(args.rows)
+        print(f"{args.rows} rows, best of {args.repeat}")
+        measure_serialization(app, args.repeat)
+    measure_requests(app, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Párhuzamos foglalási stresszteszt.
+
+Sok szálon, egymást átfedő időszakokra küld /api/reservation/add kéréseket
+néhány szobára, majd SQL-lel ellenőrzi, hogy egyetlen szoba sincs duplán
+lefoglalva. Futtatás a HotelGuruApp mappából:
+
+    python benchmarks/stress_booking.py --db file --attempts 2000 --threads 16
+    python benchmarks/stress_booking.py --db memory
+
+A "memory" mód RAM-ban (/dev/shm) tartott SQLite fájlt használ, mert a
+megosztott cache-ű in-memory adatbázis nem kezel valódi párhuzamos írókat.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import bindparam, text
+
+from config import Config
+from app import create_app
+from app.extensions import db
+from app.models.reservation import ACTIVE_STATUSES
+
+
+def make_config(kind):
+    ram_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    folder = tempfile.mkdtemp(dir=ram_dir if kind == "memory" else None)
+
+    class StressConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(folder, "stress_booking.db")
+        RESPONSE_CACHE_BACKEND = "memory"
+        TESTING = True
+
+    return StressConfig
+
+
+def seed(app, rooms):
+    from app.models.address import Address
+    from app.models.role import Role
+    from app.models.room import Room
+    from app.models.room_type import RoomType
+    from app.models.user import User
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Role(name="Guest"), RoomType(name="Egy ágyas")])
+        db.session.flush()
+        for i in range(rooms):
+            db.session.add(Room(number=100 + i, floor=1, name=f"Szoba {100 + i}", price=10000, room_type_id=1))
+        db.session.add(User(name="Stressz", email="stress@hotelguru.hu", password="x", phone="0",
+                            address=Address(city="Veszprém", street="Egyetem u. 1", postalcode=8200)))
+        db.session.commit()
+
+
+def double_bookings(app):
+    # Ugyanaz az "élő foglalás" szabály, amit a szolgáltatás is érvényesít
+    with app.app_context():
+        return db.session.execute(text("""
+            SELECT a.room_id, a.reservation_id, b.reservation_id
+            FROM reservation_room a
+            JOIN reservation_room b ON a.room_id = b.room_id AND a.reservation_id < b.reservation_id
+            JOIN reservations ra ON ra.id = a.reservation_id
+            JOIN reservations rb ON rb.id = b.reservation_id
+            WHERE ra.start_date < rb.end_date AND rb.start_date < ra.end_date
+              AND ra.status IN :active AND rb.status IN :active
+        """).bindparams(bindparam("active", expanding=True)), {"active": list(ACTIVE_STATUSES)}).all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", choices=["memory", "file"], default="file")
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rooms", type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_app(config_class=make_config(args.db))
+    seed(app, args.rooms)
+    client = app.test_client()
+    first_day = date(2025, 6, 1)
+
+    def attempt(i):
+        rnd = random.Random(i)
+        start = first_day + timedelta(days=rnd.randrange(30))
+        response = client.post("/api/reservation/add", json={
+            "user": 1,
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=rnd.randint(1, 4))).isoformat(),
+            "reservation_date": first_day.isoformat(),
+            "room_numbers": [100 + rnd.randrange(args.rooms)],
+        })
+        return response.status_code
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        statuses = Counter(pool.map(attempt, range(args.attempts)))
+    elapsed = time.perf_counter() - began
+
+    conflicts = double_bookings(app)
+    print(f"db={args.db} attempts={args.attempts} threads={args.threads} elapsed={elapsed:.2f}s")
+    print("status codes:", dict(sorted(statuses.items())))
+    print("double bookings:", len(conflicts))
+    sys.exit(1 if conflicts or statuses.get(500) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,77 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI')\
         or 'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Kapcsolatkészlet: méret, túlcsordulás, várakozás (s), újranyitás (s, -1 = soha), ellenőrzés kiadás előtt
+    # (hálózati adatbázishoz; SQLite fájlnál felesleges lekérdezés)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 30)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 3600)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '').lower() in ('1', 'true')
+    # Olvasó replikák (vesszővel elválasztott URI-k): a @replica jelölt GET végpontok ezekről olvasnak.
+    # Írás után az adott kliens DB_REPLICA_STICKY másodpercig az elsődlegesről olvas (read-your-writes).
+    # "flask replica-sync" SQLite fájlokat másol DB_REPLICA_SYNC_INTERVAL másodpercenként (helyi teszteléshez)
+    DB_REPLICA_URIS = [uri for uri in (os.environ.get('DB_REPLICA_URIS') or "").split(",") if uri]
+    DB_REPLICA_STICKY = float(os.environ.get('DB_REPLICA_STICKY') or 5)
+    DB_REPLICA_SYNC_INTERVAL = float(os.environ.get('DB_REPLICA_SYNC_INTERVAL') or 1)
+    # SQLite pragmák minden új kapcsolaton ("" = az SQLite alapértelmezése marad).
+    # WAL: az olvasók nem várnak az íróra; busy_timeout (ms): ennyit vár a zárra "database is locked" előtt;
+    # cache_size negatív értéke KiB-ban értendő
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', "WAL")
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', "NORMAL")
+    SQLITE_BUSY_TIMEOUT = os.environ.get('SQLITE_BUSY_TIMEOUT', "15000")
+    SQLITE_CACHE_SIZE = os.environ.get('SQLITE_CACHE_SIZE', "-65536")
+    SQLITE_MMAP_SIZE = os.environ.get('SQLITE_MMAP_SIZE', "268435456")
+    # Bejelentkezési token érvényessége másodpercben
+    AUTH_TOKEN_MAX_AGE = int(os.environ.get('AUTH_TOKEN_MAX_AGE') or 3600)
+    # Jelszó hash: werkzeug módszer paraméterekkel (pl. "scrypt:32768:8:1" vagy "pbkdf2:sha256:600000"),
+    # eltérő tárolt hash bejelentkezéskor újrahashelődik
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or "scrypt:32768:8:1"
+    PASSWORD_HASH_SALT_LENGTH = int(os.environ.get('PASSWORD_HASH_SALT_LENGTH') or 16)
+    # Hash szálak száma és a várakozó kérések felső korlátja, felette 503
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE') or 2 * PASSWORD_HASH_WORKERS)
+
+    # Törzsadat ETag: ennyi másodpercig használja egy worker a gyorsítótárazott verziószámot
+    REFERENCE_VERSION_TTL = float(os.environ.get('REFERENCE_VERSION_TTL') or 1.0)
+
+    # Válasz gyorsítótár: "sqlite" (workerek közös fájlja), "memory" (folyamaton belüli LRU, csak egy
+    # workerrel helyes: az érvénytelenítés a többi worker példányát nem éri el) vagy "none"
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND') or "sqlite"
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 60)
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 1024)
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH') or os.path.join(basedir, 'instance', 'response_cache.db')
+    # Válasz tömörítés: a kliens által elfogadott kódolások közül az első ebből a sorrendből ("" = kikapcsolva).
+    # COMPRESS_MIN_SIZE bájt alatt nem tömörít, COMPRESS_STREAM_SIZE felett (kódolástól függetlenül) darabonként,
+    # chunked átvitellel küld; a törzs ekkor már kész, csak a tömörítés és az átvitel darabolt
+    COMPRESS_ALGORITHMS = os.environ.get('COMPRESS_ALGORITHMS', "zstd,br,gzip")
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 1024)
+    COMPRESS_STREAM_SIZE = int(os.environ.get('COMPRESS_STREAM_SIZE') or 256 * 1024)
+    COMPRESS_CHUNK_SIZE = int(os.environ.get('COMPRESS_CHUNK_SIZE') or 64 * 1024)
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL') or 6)
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL') or 4)
+    COMPRESS_ZSTD_LEVEL = int(os.environ.get('COMPRESS_ZSTD_LEVEL') or 3)
+    # N+1 védelem: GET kérés alatt a lusta betöltés hibát dob; X-Query-Count fejléc
+    SQLALCHEMY_STRICT_LOADING = os.environ.get('SQLALCHEMY_STRICT_LOADING', '').lower() in ('1', 'true')
+    SQLALCHEMY_RECORD_QUERIES = os.environ.get('SQLALCHEMY_RECORD_QUERIES', '').lower() in ('1', 'true')
+
+    # "flask serve": többfolyamatos szerver (gunicorn). SERVER_MAX_REQUESTS kérés után a worker újraindul
+    # (0 = soha), a jitter miatt nem egyszerre. SERVER_PRELOAD: az alkalmazás a forkolás előtt töltődik be
+    SERVER_BIND = os.environ.get('SERVER_BIND') or "127.0.0.1:8888"
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS') or 2 * (os.cpu_count() or 1) + 1)
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS') or 1)
+    SERVER_PRELOAD = os.environ.get('SERVER_PRELOAD', 'true').lower() in ('1', 'true')
+    SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS') or 10000)
+    SERVER_MAX_REQUESTS_JITTER = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER') or 1000)
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT') or 30)
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT') or 30)
+    SERVER_KEEPALIVE = int(os.environ.get('SERVER_KEEPALIVE') or 5)
+    SERVER_PIDFILE = os.environ.get('SERVER_PIDFILE') or ""
+    SERVER_ACCESS_LOG = os.environ.get('SERVER_ACCESS_LOG') or ""
+
+    # Foglalások életciklusa: ennyi nap után jár le a meg nem erősített foglalás
+    RESERVATION_CONFIRM_DAYS = int(os.environ.get('RESERVATION_CONFIRM_DAYS') or 2)
+    # Háttérfolyamat futási gyakorisága másodpercben (0 = kikapcsolva)
+    RESERVATION_SWEEP_INTERVAL = int(os.environ.get('RESERVATION_SWEEP_INTERVAL') or 0)
+    RESERVATION_SWEEP_BATCH = int(os.environ.get('RESERVATION_SWEEP_BATCH') or 1000)
 
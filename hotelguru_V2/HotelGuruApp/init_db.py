@@ -9,6 +9,10 @@ app = create_app(config_class=Config)
 
 app.app_context().push()
 
+# A törzsadat végpontok ETag-je a verziószámból készül: feltöltéskor ezt is léptetni kell,
+# különben a korábban (üres listára) kapott ETag-gel a kliens 304-et és régi adatot kapna
+from app.conditional import bump_version
+
 #Role
 from app.models.role import Role
 
@@ -16,6 +20,7 @@ if not Role.query.first():
     db.session.add_all([ Role(name="Administrator"), 
                          Role(name="Receptionist"), 
                          Role(name ="Guest") ])
+    bump_version("roles")
     db.session.commit()
     print("A roles -ok sikeresen feltöltve!")
 else:
@@ -31,6 +36,7 @@ if not RoomType.query.first():
         RoomType(name="Lakosztály"),
         RoomType(name="Apartman")
     ])
+    bump_version("room_types")
     db.session.commit()
     print("Szobatípusok sikeresen feltöltve!")
 else:
@@ -58,6 +64,7 @@ if not Service.query.first():
                         Service(name="Parkolás", description="Parkoló használat", price=500),
                         Service(name="Wellness", description="Wellness szolgáltatás", price=2000), 
                         Service(name="Takarítás", description="Szobatakítás", price=1000) ])
+    bump_version("services")
     db.session.commit()
     print("A Szolgáltatások sikeresen feltöltve!")
 else:
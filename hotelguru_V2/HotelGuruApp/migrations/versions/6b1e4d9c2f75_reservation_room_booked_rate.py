@@ -0,0 +1,39 @@
+"""reservation room booked rate
+
+Revision ID: 6b1e4d9c2f75
+Revises: 4f9a2e6c8d17
+Create Date: 2025-04-29 10:12:47.318206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1e4d9c2f75'
+down_revision = '4f9a2e6c8d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reservation_room', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('price', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('room_type_id', sa.Integer(), nullable=True))
+
+    # A meglévő foglalások a szoba mostani árát és típusát kapják (ebből épült a napi összesítő is)
+    op.execute('UPDATE reservation_room SET '
+               'price = (SELECT price FROM rooms WHERE rooms.id = reservation_room.room_id), '
+               'room_type_id = (SELECT room_type_id FROM rooms WHERE rooms.id = reservation_room.room_id)')
+
+    with op.batch_alter_table('reservation_room', schema=None) as batch_op:
+        batch_op.alter_column('price', existing_type=sa.Float(), nullable=False)
+        batch_op.alter_column('room_type_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(batch_op.f('fk_reservation_room_room_type_id_room_types'), 'room_types', ['room_type_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('reservation_room', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_reservation_room_room_type_id_room_types'), type_='foreignkey')
+        batch_op.drop_column('room_type_id')
+        batch_op.drop_column('price')
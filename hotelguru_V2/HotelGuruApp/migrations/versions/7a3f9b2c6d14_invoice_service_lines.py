@@ -0,0 +1,52 @@
+"""invoice service lines with quantity and unit price
+
+Revision ID: 7a3f9b2c6d14
+Revises: c41f6a9e2d58
+Create Date: 2025-04-24 10:12:31.448120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3f9b2c6d14'
+down_revision = 'c41f6a9e2d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoice_service', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('unit_price', sa.Float(), nullable=True))
+
+    # A used_services szövegben felsorolt, de a kapcsolótáblából hiányzó szolgáltatások átemelése
+    bind = op.get_bind()
+    lines = set()
+    for invoice_id, used_services in bind.execute(sa.text("SELECT id, used_services FROM invoices WHERE used_services != ''")):
+        lines.update((invoice_id, int(service_id)) for service_id in used_services.split(",") if service_id.strip())
+    if lines:
+        bind.execute(
+            sa.text("INSERT OR IGNORE INTO invoice_service (invoice_id, service_id) VALUES (:invoice_id, :service_id)"),
+            [{"invoice_id": invoice_id, "service_id": service_id} for invoice_id, service_id in sorted(lines)]
+        )
+    op.execute('UPDATE invoice_service SET unit_price = COALESCE((SELECT price FROM services WHERE services.id = invoice_service.service_id), 0)')
+
+    with op.batch_alter_table('invoice_service', schema=None) as batch_op:
+        batch_op.alter_column('unit_price', existing_type=sa.Float(), nullable=False)
+
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.drop_column('used_services')
+
+
+def downgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('used_services', sa.String(length=200), server_default='', nullable=False))
+
+    op.execute("""UPDATE invoices SET used_services = COALESCE(
+        (SELECT group_concat(service_id, ',') FROM invoice_service WHERE invoice_service.invoice_id = invoices.id), '')""")
+
+    with op.batch_alter_table('invoice_service', schema=None) as batch_op:
+        batch_op.drop_column('unit_price')
+        batch_op.drop_column('quantity')